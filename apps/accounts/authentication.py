@@ -1,24 +1,114 @@
 """
 Custom JWT authentication that works with or without 'Bearer' prefix.
+
+With ACCOUNTS_STATELESS_JWT enabled, access tokens also carry the user's
+roles and active flag, and requests authenticate as a RoleTokenUser built
+from those claims without loading the user row.
+
+Validated tokens are kept in a per-process LRU keyed by a hash of the raw
+token, so clients that reuse one access token skip signature and claim
+checks on repeat requests. Caching never outlives revocation: access
+tokens cannot be blacklisted, and the user is still loaded (and checked
+to be active) on every request outside stateless mode.
 """
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from apps.core.lru import LRUCache
+from .roles import get_roles
+
+ROLES_CLAIM = 'roles'
+ACTIVE_CLAIM = 'is_active'
+
+
+# Validated tokens per process; entries never outlive the token's exp
+token_cache = LRUCache(
+    maxsize=getattr(settings, 'ACCOUNTS_TOKEN_CACHE_SIZE', 4096),
+    ttl=getattr(settings, 'ACCOUNTS_TOKEN_CACHE_TTL', 300),
+)
+
+
+def stateless_tokens_enabled():
+    return getattr(settings, 'ACCOUNTS_STATELESS_JWT', False)
+
+
+def add_role_claims(token, user):
+    """Embed the user's current roles and active flag in a token."""
+    token[ROLES_CLAIM] = sorted(get_roles(user))
+    token[ACTIVE_CLAIM] = user.is_active
+
+
+class RoleTokenUser(TokenUser):
+    """
+    User backed only by a validated access token.
+    Roles come from the token, so permission checks need no queries.
+    Views that need the full model load it with load_user().
+    """
+
+    def __init__(self, token):
+        super().__init__(token)
+        self._roles = frozenset(token.get(ROLES_CLAIM, ()))
+
+    @cached_property
+    def id(self):
+        # Claims hold the id as a string; compare equal to foreign keys
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+
+def load_user(user):
+    """Return the database User for request.user, loading it if stateless."""
+    from .models import User
+
+    if isinstance(user, User):
+        return user
+    return User.objects.get(pk=user.pk)
 
 
 class FlexibleJWTAuthentication(JWTAuthentication):
     """
     JWT authentication that accepts tokens with or without 'Bearer' prefix.
-    
+
     Accepts:
     - Authorization: Bearer <token>
     - Authorization: <token>
     """
-    
+
     def get_header(self, request):
         """Get the Authorization header and auto-add 'Bearer ' if missing."""
         header = super().get_header(request)
-        
+
         if header and not header.startswith(b'Bearer '):
             # Token provided without 'Bearer' prefix - add it
             header = b'Bearer ' + header
-        
+
         return header
+
+    def get_validated_token(self, raw_token):
+        """Return the validated token from the LRU, or validate and cache it."""
+        key = hashlib.sha256(raw_token).hexdigest()
+        token = token_cache.get(key)
+        if token is not None:
+            return token
+
+        token = super().get_validated_token(raw_token)
+        remaining = token.get('exp', 0) - time.time()
+        if remaining > 0:
+            token_cache.set(key, token, ttl=min(remaining, token_cache.ttl))
+        return token
+
+    def get_user(self, validated_token):
+        """
+        Build a RoleTokenUser from role claims in stateless mode; tokens
+        issued without them still load the user from the database.
+        """
+        if not stateless_tokens_enabled() or ROLES_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        if not validated_token.get(ACTIVE_CLAIM, True):
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return RoleTokenUser(validated_token)
@@ -0,0 +1,154 @@
+"""
+Negative cache in front of the refresh token blacklist.
+
+Each process keeps a bloom filter of blacklisted, unexpired token ids
+(jti). With a shared cache backend a jti that is not in the filter is
+certainly not blacklisted, so the common case needs no query; possible
+matches fall through to the database. Without one (CACHE_IS_SHARED off)
+revocations made by other workers cannot reach the filter, so every
+check goes to the database. The same holds for shared backends whose
+incr() is not atomic (CACHE_HAS_ATOMIC_INCR off, e.g. the file cache):
+two workers could take the same sequence number and overwrite each
+other's log entry, losing a revocation.
+
+Revocations are published to a log in the shared cache: a sequence
+counter plus one entry per blacklisted jti. Processes add new entries to
+their filter as they see them, and only reload the blacklist from the
+database on first use, when they fall too far behind, when log entries
+were evicted, or when the filter is full.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.utils import timezone
+from apps.core.cache import AppCache, cache_has_atomic_incr, cache_is_shared
+
+# Namespace of the revocation log (the generation is not used)
+blacklist_cache = AppCache('token_blacklist')
+
+# Seconds log entries are kept; processes further behind reload instead
+LOG_ENTRY_TIMEOUT = 24 * 60 * 60
+# Most log entries read in one catch-up before reloading is cheaper
+MAX_CATCH_UP = 1000
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @property
+    def full(self):
+        """Past capacity the false positive rate climbs above error_rate."""
+        return self.count >= self.capacity
+
+    def _positions(self, item):
+        # Double hashing: two 64-bit halves of one digest give k positions
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    """Process-local bloom filter of blacklisted jtis, fed by the revocation log."""
+
+    min_capacity = 1024
+
+    def __init__(self, cache=blacklist_cache):
+        self.cache = cache
+        self.sequence = None
+        self.bloom = None
+        self._lock = threading.Lock()
+
+    @property
+    def sequence_key(self):
+        return f'{self.cache.namespace}:sequence'
+
+    def entry_key(self, number):
+        return f'{self.cache.namespace}:jti:{number}'
+
+    def might_be_blacklisted(self, jti):
+        """False means the token is certainly not blacklisted."""
+        if not (cache_is_shared() and cache_has_atomic_incr()):
+            return True
+        with self._lock:
+            self.sync()
+            return jti in self.bloom
+
+    def current_sequence(self):
+        backend = self.cache.backend
+        sequence = backend.get(self.sequence_key)
+        if sequence is None:
+            # Start from the clock so a reset log is never mistaken for
+            # entries already seen
+            backend.add(self.sequence_key, time.time_ns(), timeout=None)
+            sequence = backend.get(self.sequence_key)
+        return sequence
+
+    def sync(self):
+        """Add revocations logged since the last sync, reloading if needed."""
+        sequence = self.current_sequence()
+        if (
+            self.bloom is None or self.bloom.full
+            or sequence < self.sequence or sequence - self.sequence > MAX_CATCH_UP
+        ):
+            self.rebuild(sequence)
+            return
+        if sequence == self.sequence:
+            return
+
+        keys = [self.entry_key(number) for number in range(self.sequence + 1, sequence + 1)]
+        entries = self.cache.backend.get_many(keys)
+        if len(entries) < len(keys):
+            # Evicted (or not yet written) entries leave a gap
+            self.rebuild(sequence)
+            return
+        for jti in entries.values():
+            self.bloom.add(jti)
+        self.sequence = sequence
+
+    def rebuild(self, sequence):
+        """Reload every unexpired blacklisted jti; the log up to `sequence` is included."""
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list('token__jti', flat=True)
+        )
+        bloom = BloomFilter(max(len(jtis) * 2, self.min_capacity))
+        for jti in jtis:
+            bloom.add(jti)
+        self.bloom = bloom
+        self.sequence = sequence
+
+    def publish(self, jti):
+        """Log a committed revocation for every process's filter."""
+        backend = self.cache.backend
+        try:
+            number = backend.incr(self.sequence_key)
+        except ValueError:
+            backend.add(self.sequence_key, time.time_ns(), timeout=None)
+            number = backend.incr(self.sequence_key)
+        backend.set(self.entry_key(number), jti, LOG_ENTRY_TIMEOUT)
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+
+blacklist_filter = BlacklistFilter()
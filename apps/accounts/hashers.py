@@ -0,0 +1,53 @@
+"""
+Password hashers with cost parameters taken from settings.
+
+PASSWORD_HASHERS lists the profile chosen by ACCOUNTS_PASSWORD_HASHER
+first and the other profiles after it, so existing hashes still verify.
+Django rehashes a password on the next successful login whenever its
+algorithm or cost differs from the preferred hasher's, so changing the
+profile or its cost migrates users transparently.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with ACCOUNTS_PBKDF2_ITERATIONS."""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'ACCOUNTS_PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Scrypt with ACCOUNTS_SCRYPT_WORK_FACTOR (N) and ACCOUNTS_SCRYPT_BLOCK_SIZE (r)."""
+
+    # Upper bound only; OpenSSL's 32 MiB default rejects N above 2**14
+    maxmem = 256 * 1024 * 1024
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'ACCOUNTS_SCRYPT_WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return getattr(settings, 'ACCOUNTS_SCRYPT_BLOCK_SIZE', hashers.ScryptPasswordHasher.block_size)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id with ACCOUNTS_ARGON2_TIME_COST, ACCOUNTS_ARGON2_MEMORY_COST
+    (KiB) and ACCOUNTS_ARGON2_PARALLELISM. Needs the argon2-cffi package.
+    """
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'ACCOUNTS_ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'ACCOUNTS_ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'ACCOUNTS_ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
@@ -0,0 +1,70 @@
+"""
+Management command to measure login throughput per password hasher profile.
+
+Each profile hashes a password once, then verifies it repeatedly in this
+process, the same work a login does on one sync worker. Use the results
+to pick ACCOUNTS_PASSWORD_HASHER and its cost within the latency budget.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.crypto import get_random_string
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = 'Benchmark password verification (logins/sec per worker) for each hasher profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'profiles', nargs='*',
+            help='Profiles from PASSWORD_HASHER_PROFILES (default: all)'
+        )
+        parser.add_argument('--rounds', type=int, default=20, help='Verifications per profile (default: 20)')
+        parser.add_argument('--budget-ms', type=float, help='Flag profiles slower than this per login')
+
+    def handle(self, *args, **options):
+        profiles = getattr(settings, 'PASSWORD_HASHER_PROFILES', {})
+        names = options['profiles'] or list(profiles)
+        unknown = [name for name in names if name not in profiles]
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(unknown)}. Choose from: {', '.join(profiles)}.")
+        if options['rounds'] <= 0:
+            raise CommandError('--rounds must be positive.')
+
+        password = get_random_string(16)
+        for name in names:
+            hasher = import_string(profiles[name])()
+            try:
+                encoded = hasher.encode(password, hasher.salt())
+            except ValueError as e:
+                # Hasher library not installed
+                self.stdout.write(self.style.WARNING(f'{name}: skipped ({e})'))
+                continue
+
+            timings = []
+            for _ in range(options['rounds']):
+                started = time.perf_counter()
+                hasher.verify(password, encoded)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            median = statistics.median(timings)
+            line = (
+                f'{name}: {1000 / median:.1f} logins/sec per worker, '
+                f'median {median:.1f} ms, max {max(timings):.1f} ms ({self.describe(hasher, encoded)})'
+            )
+            if options['budget_ms'] is not None and median > options['budget_ms']:
+                self.stdout.write(self.style.WARNING(f'{line} over budget'))
+            else:
+                self.stdout.write(line)
+
+        self.stdout.write(f"Current profile: {getattr(settings, 'ACCOUNTS_PASSWORD_HASHER', 'pbkdf2')}")
+
+    def describe(self, hasher, encoded):
+        """Cost parameters of a hash, without the salt or digest."""
+        summary = hasher.safe_summary(encoded)
+        return ', '.join(
+            f'{key} {value}' for key, value in summary.items() if key not in ('algorithm', 'salt', 'hash')
+        )
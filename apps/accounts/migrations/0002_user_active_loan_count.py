@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-18 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='active_loan_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
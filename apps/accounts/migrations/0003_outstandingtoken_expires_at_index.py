@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index token expiry so prune_tokens and the blacklist filter can range-scan it.
+
+    The table belongs to simplejwt's token_blacklist app, which ships no such
+    index and cannot take migrations from this project, so the index lives
+    here; IF [NOT] EXISTS keeps it safe if simplejwt ever adds its own.
+    """
+
+    dependencies = [
+        ('accounts', '0002_user_active_loan_count'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS token_outstanding_expires_at_idx '
+            'ON token_blacklist_outstandingtoken (expires_at)',
+            reverse_sql='DROP INDEX IF EXISTS token_outstanding_expires_at_idx',
+        ),
+    ]
@@ -4,6 +4,7 @@ Extended User model with Django Groups integration.
 """
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from . import roles
 
 
 class User(AbstractUser):
@@ -14,6 +15,8 @@ class User(AbstractUser):
     - Members: Browse books, borrow/return books, manage own profile
     """
     email = models.EmailField(unique=True)
+    # Maintained by loan checkout/checkin to enforce borrowing limits
+    active_loan_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -27,12 +30,12 @@ class User(AbstractUser):
     @property
     def is_administrator(self):
         """Check if user belongs to Administrators group."""
-        return self.groups.filter(name='Administrators').exists()
+        return roles.is_administrator(self)
 
     @property
     def is_member(self):
         """Check if user belongs to Members group."""
-        return self.groups.filter(name='Members').exists()
+        return roles.is_member(self)
 
     def __str__(self):
         return self.email
@@ -2,6 +2,7 @@
 DRF permissions integrated with Django Groups.
 """
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from .roles import is_administrator
 
 
 class IsAdministrator(BasePermission):
@@ -11,10 +12,7 @@ class IsAdministrator(BasePermission):
     message = 'Only administrators can perform this action.'
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name='Administrators').exists()
-        )
+        return is_administrator(request.user)
 
 
 class IsMember(BasePermission):
@@ -34,10 +32,7 @@ class IsAdministratorOrReadOnly(BasePermission):
     def has_permission(self, request, view):
         if request.method in SAFE_METHODS:
             return True
-        return (
-            request.user.is_authenticated and
-            request.user.groups.filter(name='Administrators').exists()
-        )
+        return is_administrator(request.user)
 
 
 class IsOwnerOrAdministrator(BasePermission):
@@ -46,7 +41,7 @@ class IsOwnerOrAdministrator(BasePermission):
     """
     def has_object_permission(self, request, view, obj):
         # Administrators have full access
-        if request.user.groups.filter(name='Administrators').exists():
+        if is_administrator(request.user):
             return True
         # Check if the object belongs to the user
-        return hasattr(obj, 'user') and obj.user == request.user
+        return hasattr(obj, 'user_id') and obj.user_id == request.user.pk
@@ -0,0 +1,63 @@
+"""
+Role (Django group) resolution for users.
+
+A user's group names are loaded at most once per user object. With
+ACCOUNTS_ROLE_CACHE_TTL set and a shared cache backend they are also
+shared across requests through `accounts_cache`; the cached copy is
+dropped when the user's groups change (see signals.py).
+"""
+from django.conf import settings
+from apps.core.cache import accounts_cache, cache_is_shared
+
+ADMINISTRATORS = 'Administrators'
+MEMBERS = 'Members'
+
+
+def role_cache_key(user_pk):
+    return f'roles:{user_pk}'
+
+
+def role_cache_timeout():
+    """Seconds roles are shared across requests; 0 when they must not be."""
+    if not cache_is_shared():
+        return 0
+    return getattr(settings, 'ACCOUNTS_ROLE_CACHE_TTL', 0)
+
+
+def get_roles(user):
+    """Return the user's group names as a frozenset."""
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, '_roles', None)
+    if roles is None:
+        timeout = role_cache_timeout()
+        roles = accounts_cache.get(role_cache_key(user.pk)) if timeout else None
+        if roles is None:
+            roles = frozenset(user.groups.values_list('name', flat=True))
+            if timeout:
+                accounts_cache.set(role_cache_key(user.pk), roles, timeout)
+        user._roles = roles
+    return roles
+
+
+def has_role(user, role):
+    return role in get_roles(user)
+
+
+def is_administrator(user):
+    """Check if user belongs to Administrators group."""
+    return has_role(user, ADMINISTRATORS)
+
+
+def is_member(user):
+    """Check if user belongs to Members group."""
+    return has_role(user, MEMBERS)
+
+
+def invalidate_roles(user_pks=None):
+    """Drop cached roles for the given users, or for everyone."""
+    if user_pks is None:
+        accounts_cache.invalidate()
+        return
+    for pk in user_pks:
+        accounts_cache.delete(role_cache_key(pk))
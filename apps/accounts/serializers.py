@@ -2,9 +2,14 @@
 Accounts app serializers.
 """
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.models import Group
+from .authentication import add_role_claims, stateless_tokens_enabled
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -89,3 +94,32 @@ class UserAdminSerializer(serializers.ModelSerializer):
             'groups', 'is_administrator', 'is_active', 'is_staff', 'created_at'
         ]
         read_only_fields = ['id', 'created_at', 'is_administrator']
+
+
+def embed_role_claims(data, user):
+    """Re-issue the access token in `data` with the user's role claims."""
+    if stateless_tokens_enabled() and user is not None:
+        access = AccessToken(data['access'])
+        add_role_claims(access, user)
+        data['access'] = str(access)
+    return data
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login serializer; access tokens carry roles in stateless mode."""
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        return embed_role_claims(super().validate(attrs), self.user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer; roles are re-read so group changes apply on refresh."""
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if stateless_tokens_enabled():
+            user_id = AccessToken(data['access'])[api_settings.USER_ID_CLAIM]
+            embed_role_claims(data, User.objects.filter(pk=user_id).first())
+        return data
@@ -1,11 +1,18 @@
 """
 Accounts app signals.
-Auto-assign users to Members group on registration.
+Auto-assign users to Members group on registration, and keep cached
+roles and the blacklist filter in step with the database.
 """
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import Group
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .blacklist import blacklist_filter
 from .models import User
+from .roles import invalidate_roles
 
 
 @receiver(post_save, sender=User)
@@ -17,3 +24,35 @@ def assign_default_group(sender, instance, created, **kwargs):
     if created and not instance.is_superuser:
         members_group, _ = Group.objects.get_or_create(name='Members')
         instance.groups.add(members_group)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached roles after a user's groups change."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        # user.groups.add(...): the instance is the user
+        instance.__dict__.pop('_roles', None)
+        invalidate_roles([instance.pk])
+    elif pk_set is not None:
+        # group.user_set.add(...): pk_set holds the users
+        invalidate_roles(pk_set)
+    else:
+        # group.user_set.clear(): members are no longer known
+        invalidate_roles()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_roles(sender, created=False, **kwargs):
+    """A renamed or deleted group changes the roles of all its members."""
+    if not created:
+        invalidate_roles()
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def publish_blacklisted_token(sender, instance, created, **kwargs):
+    """Add the token to every process's blacklist filter once the row is committed."""
+    if created:
+        transaction.on_commit(partial(blacklist_filter.publish, instance.token.jti))
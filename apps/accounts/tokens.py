@@ -0,0 +1,14 @@
+"""
+JWT token classes.
+"""
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.settings import api_settings
+from .blacklist import blacklist_filter
+
+
+class RefreshToken(tokens.RefreshToken):
+    """Refresh token whose blacklist check skips the database when it can."""
+
+    def check_blacklist(self):
+        if blacklist_filter.might_be_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
@@ -11,20 +11,27 @@ from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
     UserUpdateSerializer,
-    UserAdminSerializer
+    UserAdminSerializer,
+    RoleTokenObtainPairSerializer,
+    RoleTokenRefreshSerializer
 )
+from .authentication import load_user
 from .permissions import IsAdministrator
 
 User = get_user_model()
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
+    serializer_class = RoleTokenObtainPairSerializer
+
     @swagger_auto_schema(operation_id="UserLogin", operation_summary="User Login", operation_description="Authenticate with email and password to get access and refresh tokens.")
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
 
 class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = RoleTokenRefreshSerializer
+
     @swagger_auto_schema(operation_id="RefreshToken", operation_summary="Refresh Access Token", operation_description="Get a new access token using a valid refresh token.")
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
@@ -67,7 +74,8 @@ class ProfileView(generics.RetrieveUpdateAPIView):
         return UserSerializer
 
     def get_object(self):
-        return self.request.user
+        # Needs the full model, also with stateless token users
+        return load_user(self.request.user)
 
     @swagger_auto_schema(operation_id="GetProfile", operation_summary="Get My Profile")
     def get(self, request, *args, **kwargs):
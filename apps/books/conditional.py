@@ -0,0 +1,69 @@
+"""
+HTTP conditional request support (ETag / Last-Modified) for book reads.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from apps.core.cache import books_cache
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified validators for list and detail views.
+
+    A matching If-None-Match or If-Modified-Since returns 304 before the
+    serializer runs:
+    - detail: ETag and Last-Modified from the book's own `updated_at`
+    - list: ETag only, from the books cache generation (bumped by every
+      write, deletes included) and the query. No Last-Modified is sent:
+      `max(updated_at)` does not move when a book is deleted, so
+      If-Modified-Since would keep matching a stale list.
+    """
+    conditional_timestamp_field = 'updated_at'
+
+    def get_detail_validators(self, pk):
+        """Return (etag, last_modified) for one object, or (None, None)."""
+        try:
+            updated_at = self.get_queryset().filter(pk=pk).values_list(
+                self.conditional_timestamp_field, flat=True
+            ).first()
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup; let the regular view return 404
+            return None, None
+        if updated_at is None:
+            return None, None
+        etag = self._make_etag(pk, updated_at.isoformat(), self.request.accepted_renderer.format)
+        return etag, int(updated_at.timestamp())
+
+    def get_filtered_queryset(self):
+        """`filter_queryset(get_queryset())`, computed once per request."""
+        if getattr(self, '_filtered_queryset', None) is None:
+            self._filtered_queryset = self.filter_queryset(self.get_queryset())
+        return self._filtered_queryset
+
+    def get_list_validators(self, request):
+        """Return (etag, None) for the filtered list."""
+        # Page, ordering and format change the body but not the generation
+        query = sorted((key, request.query_params.getlist(key)) for key in request.query_params)
+        etag = self._make_etag(books_cache.generation, query, request.accepted_renderer.format)
+        return etag, None
+
+    def get_not_modified_response(self, request, etag, last_modified):
+        """Return a 304 (or 412) response if the client's copy is current."""
+        if etag is None and last_modified is None:
+            return None
+        return get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code == 200:
+            if etag is not None:
+                response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def _make_etag(self, *parts):
+        digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+        return quote_etag(digest[:32])
@@ -0,0 +1,39 @@
+"""
+Management command to drain the deferred search refresh queue.
+Run it continuously (--loop) when BOOKS_SEARCH_REFRESH_MODE is 'deferred'.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Refresh search vectors for books queued in deferred mode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Books per batch (default: 500)')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the queue instead of exiting')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls (default: 5)')
+        parser.add_argument('--database', default='default', help='Database alias (default: default)')
+
+    def handle(self, *args, **options):
+        from apps.books.search_queue import drain_search_queue
+
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive.')
+
+        processed = 0
+        started = time.monotonic()
+        while True:
+            count = drain_search_queue(options['batch_size'], using=options['database'])
+            processed += count
+            if count:
+                elapsed = time.monotonic() - started
+                rate = f'{processed / elapsed:.0f}' if elapsed > 0 else '-'
+                self.stdout.write(f'  {processed} books refreshed ({rate} rows/sec)')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} queued books.'))
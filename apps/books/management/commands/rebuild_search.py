@@ -1,41 +1,104 @@
 """
 Management command to rebuild search vectors for all books.
 Run this after migrating to PostgreSQL or when search isn't working.
+
+Books are processed in id ranges, each committed on its own, so the
+rebuild never locks the whole table and can be resumed from the last
+reported checkpoint with --start-id.
 """
-from django.core.management.base import BaseCommand
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Max, Min
+
+
+def id_ranges(first_id, last_id, batch_size):
+    """Split [first_id, last_id] into consecutive inclusive ranges."""
+    start = first_id
+    while start <= last_id:
+        end = min(start + batch_size - 1, last_id)
+        yield start, end
+        start = end + 1
 
 
 class Command(BaseCommand):
     help = 'Rebuild search vectors for all books (PostgreSQL FTS)'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Ids per batch (default: 5000)')
+        parser.add_argument('--start-id', type=int, help='Resume from this book id (checkpoint)')
+        parser.add_argument('--only-stale', action='store_true', help='Skip rows whose vector is current')
+        parser.add_argument('--workers', type=int, default=1, help='Parallel workers (default: 1)')
+        parser.add_argument('--database', default='default', help='Database alias (default: default)')
+
     def handle(self, *args, **options):
         from apps.books.models import Book
-        
-        self.stdout.write('Rebuilding search vectors...')
-        
-        try:
-            # Use raw SQL for rebuilding search vectors
-            from django.db import connection
-            
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE books SET search_vector = 
-                        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
-                        setweight(to_tsvector('english', COALESCE(author, '')), 'A') ||
-                        setweight(to_tsvector('english', COALESCE(isbn, '')), 'B') ||
-                        setweight(to_tsvector('english', COALESCE(genre, '')), 'B') ||
-                        setweight(to_tsvector('english', COALESCE(description, '')), 'C')
-                """)
-            
-            count = Book.objects.count()
-            self.stdout.write(self.style.SUCCESS(
-                f'Successfully rebuilt search vectors for {count} books!'
-            ))
-            
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(
-                f'Error rebuilding search vectors: {e}'
-            ))
+        from apps.books.search_index import supports_search_vector
+
+        self.using = options['database']
+        self.only_stale = options['only_stale']
+        batch_size = options['batch_size']
+        workers = options['workers']
+        if batch_size <= 0 or workers <= 0:
+            raise CommandError('--batch-size and --workers must be positive.')
+
+        if not supports_search_vector(self.using):
             self.stdout.write(self.style.WARNING(
                 'This command requires PostgreSQL with pg_trgm extension.'
             ))
+            return
+
+        books = Book.objects.using(self.using)
+        if options['start_id'] is not None:
+            books = books.filter(pk__gte=options['start_id'])
+        bounds = books.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No books to rebuild.')
+            return
+
+        self.stdout.write(
+            f"Rebuilding search vectors for ids {bounds['first']}-{bounds['last']} "
+            f"in batches of {batch_size} with {workers} worker(s)..."
+        )
+
+        ranges = list(id_ranges(bounds['first'], bounds['last'], batch_size))
+        updated = 0
+        started = time.monotonic()
+        if workers == 1:
+            results = map(self.rebuild_range, ranges)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            results = executor.map(self.rebuild_range_in_worker, ranges)
+
+        # Results arrive in range order, so every range up to the current
+        # one has committed and its end is a safe checkpoint
+        for (first_id, last_id), count in zip(ranges, results):
+            updated += count
+            elapsed = time.monotonic() - started
+            rate = f'{updated / elapsed:.0f}' if elapsed > 0 else '-'
+            self.stdout.write(
+                f'  ids {first_id}-{last_id}: {count} updated '
+                f'({updated} total, {rate} rows/sec), checkpoint --start-id {last_id + 1}'
+            )
+        if workers > 1:
+            executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully rebuilt search vectors for {updated} books!'
+        ))
+
+    def rebuild_range(self, id_range):
+        """Refresh one id range in its own transaction."""
+        from apps.books.search_index import refresh_search_vector_range
+
+        with transaction.atomic(using=self.using):
+            return refresh_search_vector_range(*id_range, only_stale=self.only_stale, using=self.using)
+
+    def rebuild_range_in_worker(self, id_range):
+        try:
+            return self.rebuild_range(id_range)
+        finally:
+            # Worker threads open their own connections
+            connections[self.using].close()
@@ -0,0 +1,52 @@
+# Maintain books.search_vector in-database on PostgreSQL
+
+from django.db import migrations
+
+
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION books_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.author, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.isbn, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.genre, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS books_search_vector_update ON books;
+CREATE TRIGGER books_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, author, isbn, genre, description ON books
+    FOR EACH ROW EXECUTE PROCEDURE books_search_vector_refresh();
+
+-- Backfill rows written before the trigger existed
+UPDATE books SET title = title WHERE search_vector IS NULL;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS books_search_vector_update ON books;
+DROP FUNCTION IF EXISTS books_search_vector_refresh();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_enable_pg_trgm'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
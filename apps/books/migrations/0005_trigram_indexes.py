@@ -0,0 +1,57 @@
+# Generated by Django 4.2.17 on 2026-10-18 04:11
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    """
+    CREATE INDEX CONCURRENTLY on PostgreSQL, so building the GIN indexes
+    does not block writes to books; a plain CREATE INDEX elsewhere.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('books', '0004_search_vector_trigger'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='book_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['author'], name='book_author_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['isbn'], name='book_isbn_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['genre'], name='book_genre_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='book',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='book_description_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
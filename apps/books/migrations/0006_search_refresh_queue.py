@@ -0,0 +1,25 @@
+# Generated by Django 4.2.17 on 2026-10-18 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchRefreshQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('book_id', models.BigIntegerField(unique=True)),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'books_search_queue',
+                'ordering': ['id'],
+            },
+        ),
+    ]
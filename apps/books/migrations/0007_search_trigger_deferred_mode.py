@@ -0,0 +1,57 @@
+# Let deferred search refresh mode take over from the search vector trigger
+
+from django.db import migrations
+
+
+DEFERRABLE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION books_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    -- Sessions in deferred mode queue the refresh instead
+    IF current_setting('books.search_refresh_mode', true) = 'deferred' THEN
+        RETURN NEW;
+    END IF;
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.author, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.isbn, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.genre, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+ALWAYS_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION books_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.author, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(NEW.isbn, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.genre, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+def make_trigger_deferrable(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DEFERRABLE_TRIGGER_SQL)
+
+
+def restore_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ALWAYS_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0006_search_refresh_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_trigger_deferrable, restore_trigger),
+    ]
@@ -4,6 +4,85 @@ Books app models.
 from django.db import models
 from django.contrib.postgres.search import SearchVectorField
 from django.contrib.postgres.indexes import GinIndex
+from django.utils import timezone
+from apps.core.cache import books_cache
+from .search_index import SEARCH_FIELDS, refresh_search_vectors
+
+# Fields overwritten when an upsert hits an existing ISBN
+UPSERT_FIELDS = ('title', 'author', 'description', 'page_count', 'genre', 'published_date')
+
+
+class BookQuerySet(models.QuerySet):
+    """
+    Bulk write helpers that keep the search index and caches consistent.
+
+    bulk_create() and update() skip the post_save signals, so these
+    methods refresh search vectors in one set-based statement and drop
+    cached catalog data once per call (or queue the refresh in deferred
+    mode, see search_queue).
+    """
+
+    def bulk_upsert(self, objs, update_fields=None, batch_size=None):
+        """
+        Insert books, updating existing ones matched by ISBN.
+        Returns the number of books written.
+        """
+        objs = list(objs)
+        if not objs:
+            return 0
+        update_fields = list(update_fields or UPSERT_FIELDS)
+        now = timezone.now()
+        for obj in objs:
+            obj.created_at = obj.created_at or now
+            obj.updated_at = now
+        self.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['isbn'],
+            update_fields=[*update_fields, 'updated_at'],
+        )
+        self.filter(isbn__in=[obj.isbn for obj in objs])._schedule_search_refresh()
+        self._invalidate_caches()
+        return len(objs)
+
+    def bulk_update_with_search(self, objs, fields, batch_size=None):
+        """
+        bulk_update() that also bumps updated_at and, when a searchable
+        field changed, refreshes the rows' search vectors.
+        Returns the number of rows updated.
+        """
+        objs = list(objs)
+        if not objs:
+            return 0
+        now = timezone.now()
+        for obj in objs:
+            obj.updated_at = now
+        fields = list(dict.fromkeys([*fields, 'updated_at']))
+        updated = self.bulk_update(objs, fields, batch_size=batch_size)
+        if set(fields) & set(SEARCH_FIELDS):
+            self.filter(pk__in=[obj.pk for obj in objs])._schedule_search_refresh()
+        self._invalidate_caches()
+        return updated
+
+    def refresh_search_vectors(self):
+        """Recompute search vectors for this queryset's rows in one UPDATE."""
+        from .search_queue import trigger_maintains_search_vectors
+
+        if trigger_maintains_search_vectors(self.db):
+            return 0
+        return refresh_search_vectors(self, using=self.db)
+
+    def _schedule_search_refresh(self):
+        from .search_queue import schedule_search_refresh
+
+        schedule_search_refresh(self, using=self.db)
+
+    def _invalidate_caches(self):
+        from .search import invalidate_search_cache
+
+        invalidate_search_cache()
+        books_cache.invalidate()
 
 
 class Book(models.Model):
@@ -23,6 +102,8 @@ class Book(models.Model):
     # PostgreSQL Full-Text Search vector field
     search_vector = SearchVectorField(null=True, blank=True)
 
+    objects = BookQuerySet.as_manager()
+
     class Meta:
         db_table = 'books'
         ordering = ['-created_at']
@@ -31,29 +112,66 @@ class Book(models.Model):
             models.Index(fields=['is_available', 'genre']),
             # GIN index for full-text search (PostgreSQL only)
             GinIndex(fields=['search_vector'], name='book_search_vector_idx'),
+            # Trigram GIN indexes backing %, %> and LIKE search predicates
+            GinIndex(fields=['title'], name='book_title_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['author'], name='book_author_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['isbn'], name='book_isbn_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['genre'], name='book_genre_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['description'], name='book_description_trgm_idx', opclasses=['gin_trgm_ops']),
         ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_search_values = instance._search_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_search_values = self._search_values()
+
+    def _search_values(self):
+        # Deferred fields are not in __dict__ and count as unknown
+        return {name: self.__dict__[name] for name in SEARCH_FIELDS if name in self.__dict__}
+
+    @property
+    def search_fields_changed(self):
+        """
+        Check if any field feeding the search document changed since the
+        book was loaded or last saved. Unsaved books always count as changed.
+        """
+        loaded = getattr(self, '_loaded_search_values', None)
+        if self._state.adding or loaded is None:
+            return True
+        return self._search_values() != loaded
     
     def update_search_vector(self):
         """
         Update the search vector field for full-text search.
-        Call this after saving to update the search index.
-        Uses raw SQL for PostgreSQL compatibility.
-        """
-        from django.db import connection
-        
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE books SET search_vector = 
-                        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
-                        setweight(to_tsvector('english', COALESCE(author, '')), 'A') ||
-                        setweight(to_tsvector('english', COALESCE(isbn, '')), 'B') ||
-                        setweight(to_tsvector('english', COALESCE(genre, '')), 'B') ||
-                        setweight(to_tsvector('english', COALESCE(description, '')), 'C')
-                    WHERE id = %s
-                """, [self.pk])
-        except Exception:
-            pass  # Silently fail for non-PostgreSQL databases
+        A no-op where the database trigger maintains it, and on
+        non-PostgreSQL databases; queued in deferred refresh mode.
+        """
+        from .search_queue import schedule_search_refresh
+
+        if self.pk is None:
+            return
+        schedule_search_refresh([self.pk], using=self._state.db or 'default')
+
+
+class SearchRefreshQueue(models.Model):
+    """
+    Outbox of books whose search vector needs recomputing.
+    Only used in deferred refresh mode; drained by process_search_queue.
+    """
+    book_id = models.BigIntegerField(unique=True)
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'books_search_queue'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Search refresh for book {self.book_id}"
@@ -11,9 +11,12 @@ class CustomOrderingFilter(OrderingFilter):
     Example:
     - title_asc → title (ascending)
     - title_desc → -title (descending)
+
+    Without an explicit ordering, search results keep their relevance order.
     """
     
     ordering_param = 'ordering'
+    relevance_param = 'search'
     
     def get_ordering(self, request, queryset, view):
         """Convert _asc/_desc format to Django ordering format."""
@@ -45,5 +48,9 @@ class CustomOrderingFilter(OrderingFilter):
             if ordering:
                 return ordering
         
+        # Keep the relevance order applied by the search backend
+        if request.query_params.get(self.relevance_param, '').strip() and queryset.query.order_by:
+            return None
+
         # Return default ordering
         return self.get_default_ordering(view)
@@ -1,27 +1,163 @@
 """
 Custom pagination classes.
 """
+import hashlib
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from apps.core.cache import books_cache
+from apps.core.pagination import KeysetPagination
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids exact COUNT(*) scans on large result sets.
+
+    Counting strategy:
+    1. An exact count cached for the same filter signature is reused.
+    2. On PostgreSQL, the planner estimate (or `pg_class.reltuples` for an
+       unfiltered list) is used when it reaches
+       BOOKS_COUNT_ESTIMATE_THRESHOLD.
+    3. Otherwise the exact count is computed and cached for
+       BOOKS_COUNT_CACHE_TTL seconds.
+
+    `count_is_exact` tells which one was used.
+    """
+
+    def __init__(self, object_list, per_page, signature=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.signature = signature
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        cache_key = None
+        if self.signature is not None:
+            cache_key = f'count:{self.signature}'
+            cached = books_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        estimate = self._estimate_count()
+        threshold = getattr(settings, 'BOOKS_COUNT_ESTIMATE_THRESHOLD', 100000)
+        if estimate is not None and estimate >= threshold:
+            self.count_is_exact = False
+            return estimate
+
+        count = super().count
+        if cache_key is not None:
+            books_cache.set(cache_key, count, getattr(settings, 'BOOKS_COUNT_CACHE_TTL', 30))
+        return count
+
+    def _estimate_count(self):
+        """Planner row estimate on PostgreSQL, None elsewhere."""
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                # reltuples is -1 until the table has been analyzed
+                return row[0] if row and row[0] >= 0 else None
+
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def validate_number(self, number):
+        """
+        Only reject pages below 1 up front; with estimated or cached counts
+        the real end of the result set is found by `page()`.
+        """
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        """Return a page, never clamping the slice to an estimated count."""
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page])
+        if not object_list and number > 1:
+            raise EmptyPage('That page contains no results')
+        return self._get_page(object_list, number, self)
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     """
     Custom pagination with clear response fields.
-    
+
     Query parameters:
     - page: Page number (default: 1)
     - page_size: Items per page (default: 10, max: 100)
+    - cursor: Opt into keyset pagination (pass an empty value for the
+      first page, then follow `next`/`previous`). Not available with
+      `search`: relevance order has no column to seek on.
     """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
-    
+    cursor_query_param = 'cursor'
+    search_query_param = 'search'
+    keyset_class = KeysetPagination
+    # Parameters that do not change which rows are counted
+    count_ignored_params = ('page', 'page_size', 'cursor', 'ordering', 'format')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Use keyset pagination when a cursor parameter is present."""
+        self.keyset = None
+        if self.cursor_query_param in request.query_params:
+            if request.query_params.get(self.search_query_param, '').strip():
+                raise ValidationError({
+                    self.cursor_query_param: ['Cursor pagination is not available for search results; use page.']
+                })
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.django_paginator_class = partial(
+            EstimatedCountPaginator, signature=self.get_count_signature(request)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_signature(self, request):
+        """Hash of the normalized filter parameters that affect the count."""
+        params = sorted(
+            (key, sorted(value.strip().lower() for value in request.query_params.getlist(key)))
+            for key in request.query_params
+            if key not in self.count_ignored_params
+        )
+        return hashlib.sha256(json.dumps(params).encode()).hexdigest()
+
     def get_paginated_response(self, data):
         """Return response with clear field names."""
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'total_count': self.page.paginator.count,
             'total_pages': self.page.paginator.num_pages,
+            'count_is_exact': self.page.paginator.count_is_exact,
             'current_page': self.page.number,
             'page_size': self.get_page_size(self.request),
             'next': self.get_next_link(),
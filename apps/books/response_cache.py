@@ -0,0 +1,82 @@
+"""
+Response caching for anonymous catalog reads.
+"""
+import hashlib
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from apps.core.cache import books_cache
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Cache serialized responses of anonymous safe requests.
+
+    Entries are keyed by renderer and a hash of the path and normalized
+    query string, and live in `books_cache`, so any Book write (including
+    availability flips from loans) drops them. Requests with parameters
+    the view does not know (filters, search, ordering, pagination) are not
+    cached, so arbitrary query strings cannot flood the cache.
+    Authenticated requests always bypass the cache.
+    Use together with ConditionalGetMixin.
+    """
+    response_cache_params = ('search', 'ordering', 'format')
+
+    def get_response_cache_params(self):
+        """Query parameters that may appear in a cached request."""
+        params = set(self.response_cache_params)
+        filterset_class = getattr(self, 'filterset_class', None)
+        if filterset_class is not None:
+            params.update(filterset_class.base_filters)
+        for name in ('page_query_param', 'page_size_query_param', 'cursor_query_param'):
+            param = getattr(self.paginator, name, None)
+            if param:
+                params.add(param)
+        return params
+
+    def get_response_cache_key(self, request):
+        """Cache key for the request, or None if it must not be cached."""
+        if request.method not in SAFE_METHODS or request.user.is_authenticated:
+            return None
+        if not set(request.query_params) <= self.get_response_cache_params():
+            return None
+        query = '&'.join(
+            f'{key}={value}'
+            for key in sorted(request.query_params)
+            for value in sorted(request.query_params.getlist(key))
+        )
+        digest = hashlib.sha256(f'{request.path}?{query}'.encode()).hexdigest()
+        return f'response:{request.accepted_renderer.format}:{digest}'
+
+    def cached_read(self, request, get_validators, render):
+        """
+        Serve a read from cache when possible.
+
+        `get_validators()` returns (etag, last_modified) and `render()`
+        builds the response on a miss; conditional requests are answered
+        from the cached validators without touching the database.
+        """
+        key = self.get_response_cache_key(request)
+        entry = books_cache.get(key) if key else None
+
+        if entry is None:
+            etag, last_modified = get_validators()
+        else:
+            data, etag, last_modified = entry
+
+        not_modified = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        if entry is not None:
+            response = Response(data)
+        else:
+            response = render()
+            if key and response.status_code == 200:
+                books_cache.set(
+                    key,
+                    (response.data, etag, last_modified),
+                    getattr(settings, 'BOOKS_RESPONSE_CACHE_TTL', 60),
+                )
+        return self.set_validators(response, etag, last_modified)
@@ -3,9 +3,73 @@ Custom search backend with PostgreSQL Trigram + Full-Text Search support.
 Falls back to basic search for non-PostgreSQL databases.
 """
 from rest_framework.filters import SearchFilter
-from django.db.models import Q, Value, F
-from django.db.models.functions import Coalesce
+from django.db.models import CharField, Q, TextField, Value, F
+from django.db.models.lookups import IContains
+from django.db import connections, transaction
 from django.conf import settings
+from apps.core.cache import AppCache, books_cache
+from apps.core.lru import LRUCache
+from .filters import BookFilter
+
+
+# Ordered book-id lists per normalized search (per process)
+search_cache = LRUCache(
+    maxsize=getattr(settings, 'BOOKS_SEARCH_CACHE_SIZE', 512),
+    ttl=getattr(settings, 'BOOKS_SEARCH_CACHE_TTL', 60),
+)
+
+# Shared generation for cached search results (values are never stored);
+# unlike books_cache it is not bumped by availability flips
+search_generation = AppCache('books_search')
+
+# Filters whose results change when a book is checked out or returned
+AVAILABILITY_FILTERS = ('is_available',)
+
+
+def search_cache_key(search_term, query_params):
+    """
+    Cache key from the normalized search term, BookFilter params and ordering.
+    Pagination parameters are left out so every page shares one entry.
+    The shared search generation is part of the key, so a catalog edit in
+    any worker invalidates every worker's entries; searches filtered on
+    availability also include the books generation, which loans bump.
+    """
+    term = ' '.join(search_term.lower().split())
+    filters = tuple(sorted(
+        (name, tuple(sorted(value.strip().lower() for value in query_params.getlist(name))))
+        for name in BookFilter.base_filters
+        if name in query_params
+    ))
+    ordering = query_params.get('ordering', '').strip()
+    generations = (search_generation.generation,)
+    if any(name in query_params for name in AVAILABILITY_FILTERS):
+        generations += (books_cache.generation,)
+    return (generations, term, filters, ordering)
+
+
+class ILikeContains(IContains):
+    """
+    Case-insensitive substring match as a bare `ILIKE`.
+
+    Django's `icontains` compares `UPPER(column)`, which the trigram GIN
+    indexes on the raw columns cannot serve; `ILIKE '%term%'` can.
+    """
+    lookup_name = 'ilike_contains'
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs_sql} ILIKE {rhs_sql}', [*lhs_params, *rhs_params]
+
+
+CharField.register_lookup(ILikeContains)
+TextField.register_lookup(ILikeContains)
+
+
+def invalidate_search_cache():
+    """Drop cached search results in every worker after a catalog write."""
+    search_cache.clear()
+    search_generation.invalidate()
 
 
 def is_postgres():
@@ -46,7 +110,7 @@ class PostgresSearchFilter(SearchFilter):
         PostgreSQL-specific search using Trigram + Full-Text Search.
         """
         from django.contrib.postgres.search import (
-            SearchQuery, SearchRank, TrigramSimilarity, TrigramWordSimilarity
+            SearchQuery, SearchRank, TrigramWordSimilarity
         )
         
         # Create search query for FTS
@@ -99,31 +163,89 @@ class PostgresSearchFilter(SearchFilter):
         return queryset.filter(q_objects)
 
 
-class BookSearchFilter(PostgresSearchFilter):
+class BookSearchEngine:
     """
-    Specialized search filter for books with weighted field priority.
-    
-    Search priority:
-    - Title (highest weight)
-    - Author (high weight)
-    - ISBN (medium weight)
-    - Genre (medium weight)
-    - Description (lower weight)
+    Two-phase book search for PostgreSQL.
+
+    Phase one: pull at most `candidate_limit` ids through the indexes
+    (FTS `search_vector @@ query` ranked by ts_rank, and trigram `%>`,
+    `LIKE` on isbn and `ILIKE` substring matches on title and author,
+    ranked by title word similarity).
+    Phase two: compute the weighted score for those candidates only and
+    return their ids best first.
+
+    Each phase-one query is capped separately, so a search returns at
+    most 2 x `candidate_limit` (BOOKS_SEARCH_CANDIDATE_LIMIT) books.
     """
-    
-    def _postgres_search(self, queryset, search_term, view):
+
+    def __init__(self, candidate_limit=None, trigram_threshold=0.1, word_similarity_threshold=0.3):
+        if candidate_limit is None:
+            candidate_limit = getattr(settings, 'BOOKS_SEARCH_CANDIDATE_LIMIT', 200)
+        self.candidate_limit = candidate_limit
+        self.trigram_threshold = trigram_threshold
+        self.word_similarity_threshold = word_similarity_threshold
+
+    def set_similarity_thresholds(self, queryset):
         """
-        Enhanced book search with custom trigram weights.
+        Set the pg_trgm thresholds used by the % and %> operators for the
+        current transaction only, so they never leak into other requests
+        on a pooled or persistent connection.
         """
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true), "
+                "set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(self.trigram_threshold), str(self.word_similarity_threshold)],
+            )
+
+    def candidate_ids(self, queryset, search_term):
+        """Phase one: bounded candidate retrieval using indexed predicates only."""
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, TrigramWordSimilarity
+        )
+
+        search_query = SearchQuery(search_term, config='english')
+        queryset = queryset.order_by()
+
+        fts_ids = queryset.filter(
+            search_vector=search_query
+        ).annotate(
+            rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-rank').values_list('pk', flat=True)[:self.candidate_limit]
+
+        trigram_ids = queryset.filter(
+            Q(title__trigram_word_similar=search_term) |
+            Q(author__trigram_word_similar=search_term) |
+            Q(genre__trigram_word_similar=search_term) |
+            Q(description__trigram_word_similar=search_term) |
+            Q(isbn__contains=search_term) |
+            Q(title__ilike_contains=search_term) |
+            Q(author__ilike_contains=search_term)
+        ).annotate(
+            title_word_sim=TrigramWordSimilarity(search_term, 'title')
+        ).order_by('-title_word_sim').values_list('pk', flat=True)[:self.candidate_limit]
+
+        # The thresholds are transaction-local, so set them and run the
+        # query in the same transaction
+        with transaction.atomic(using=queryset.db):
+            self.set_similarity_thresholds(queryset)
+            return list(fts_ids.union(trigram_ids))
+
+    def ranked_ids(self, queryset, search_term):
+        """Phase two: weighted scoring of the candidates, best first."""
         from django.contrib.postgres.search import (
             SearchQuery, SearchRank, TrigramSimilarity
         )
-        from django.db.models.functions import Greatest, Coalesce
-        
+        from django.db.models.functions import Greatest
+
+        candidates = self.candidate_ids(queryset, search_term)
+        if not candidates:
+            return []
+
         search_query = SearchQuery(search_term, config='english')
-        
-        # Weighted trigram similarity for different fields
-        queryset = queryset.annotate(
+        scored = queryset.model._default_manager.using(queryset.db).filter(
+            pk__in=candidates
+        ).annotate(
             # Title similarity (most important)
             title_sim=TrigramSimilarity('title', search_term),
             # Author similarity 
@@ -133,7 +255,7 @@ class BookSearchFilter(PostgresSearchFilter):
             # Genre similarity
             genre_sim=TrigramSimilarity('genre', search_term),
             # Description similarity
-            desc_sim=TrigramSimilarity(Coalesce('description', Value('')), search_term),
+            desc_sim=TrigramSimilarity('description', search_term),
             # Combined weighted similarity
             combined_similarity=Greatest(
                 F('title_sim') * 1.5,  # Title gets 1.5x weight
@@ -144,12 +266,60 @@ class BookSearchFilter(PostgresSearchFilter):
             ),
             # FTS rank
             rank=SearchRank(F('search_vector'), search_query)
-        ).filter(
-            Q(combined_similarity__gte=self.trigram_threshold) |
-            Q(search_vector=search_query) |
-            Q(title__icontains=search_term) |
-            Q(author__icontains=search_term) |
-            Q(isbn__icontains=search_term)
-        ).order_by('-rank', '-combined_similarity')
-        
-        return queryset
+        ).order_by('-rank', '-combined_similarity', 'pk')
+
+        return list(scored.values_list('pk', flat=True))
+
+
+def order_by_ids(queryset, ids):
+    """Restrict a queryset to `ids`, preserving their order."""
+    from django.db.models import Case, IntegerField, When
+
+    if not ids:
+        return queryset.none()
+    position = Case(
+        *[When(pk=pk, then=Value(index)) for index, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).annotate(search_position=position).order_by('search_position')
+
+
+class BookSearchFilter(PostgresSearchFilter):
+    """
+    Specialized search filter for books with weighted field priority.
+    
+    Search priority:
+    - Title (highest weight)
+    - Author (high weight)
+    - ISBN (medium weight)
+    - Genre (medium weight)
+    - Description (lower weight)
+
+    Runs after the BookFilter filters, so candidates already satisfy
+    them; see BookSearchEngine for the two phases. Results are ordered
+    by relevance unless an explicit ordering is requested.
+
+    Ranked ids are cached in `search_cache` per normalized term, filters
+    and ordering, so repeated searches only hydrate a page of ids.
+    """
+
+    word_similarity_threshold = 0.3  # pg_trgm.word_similarity_threshold
+
+    def filter_queryset(self, request, queryset, view):
+        search_term = request.query_params.get(self.search_param, '').strip()
+
+        if not search_term or not is_postgres():
+            return super().filter_queryset(request, queryset, view)
+
+        key = search_cache_key(search_term, request.query_params)
+        ids = search_cache.get(key)
+        if ids is None:
+            ids = self.get_engine().ranked_ids(queryset, search_term)
+            search_cache.set(key, ids)
+        return order_by_ids(queryset, ids)
+
+    def get_engine(self):
+        return BookSearchEngine(
+            trigram_threshold=self.trigram_threshold,
+            word_similarity_threshold=self.word_similarity_threshold,
+        )
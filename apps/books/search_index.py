@@ -0,0 +1,88 @@
+"""
+Search vector maintenance for the books table.
+
+On PostgreSQL the weighted document is kept current by the
+`books_search_vector_update` trigger (migration 0004), except for app
+connections in deferred refresh mode (see search_queue). The helpers here
+cover those, databases where the trigger is missing and full rebuilds.
+"""
+from functools import lru_cache
+
+from django.db import connections
+
+SEARCH_TRIGGER_NAME = 'books_search_vector_update'
+
+# Columns that feed the search document
+SEARCH_FIELDS = ('title', 'author', 'isbn', 'genre', 'description')
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(author, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(isbn, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(genre, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+"""
+
+
+def supports_search_vector(using='default'):
+    """Check if the database can build tsvectors (PostgreSQL only)."""
+    return connections[using].vendor == 'postgresql'
+
+
+@lru_cache(maxsize=None)
+def search_trigger_installed(using='default'):
+    """
+    Check if the database maintains search_vector itself.
+    Cached per process; the trigger is installed by a migration.
+    """
+    if not supports_search_vector(using):
+        return False
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_trigger WHERE tgname = %s AND NOT tgisinternal',
+            [SEARCH_TRIGGER_NAME],
+        )
+        return cursor.fetchone() is not None
+
+
+def refresh_search_vectors(ids=None, using='default'):
+    """
+    Recompute search_vector in one set-based UPDATE.
+
+    Refreshes the given book ids, or the whole table when `ids` is None.
+    `ids` may also be a Book queryset, which is inlined as a subquery.
+    Returns the number of rows updated (0 on non-PostgreSQL databases).
+    """
+    if not supports_search_vector(using):
+        return 0
+    sql = f'UPDATE books SET search_vector = {SEARCH_VECTOR_SQL}'
+    params = []
+    if hasattr(ids, 'query'):
+        subquery, params = ids.order_by().values('pk').query.sql_with_params()
+        sql += f' WHERE id IN ({subquery})'
+    elif ids is not None:
+        ids = list(ids)
+        if not ids:
+            return 0
+        sql += ' WHERE id = ANY(%s)'
+        params.append(ids)
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def refresh_search_vector_range(first_id, last_id, only_stale=False, using='default'):
+    """
+    Recompute search_vector for books with first_id <= id <= last_id.
+
+    With `only_stale`, rows whose vector already matches are left alone so
+    they are not rewritten. Returns the number of rows updated.
+    """
+    if not supports_search_vector(using):
+        return 0
+    sql = f'UPDATE books SET search_vector = {SEARCH_VECTOR_SQL} WHERE id BETWEEN %s AND %s'
+    if only_stale:
+        sql += f' AND search_vector IS DISTINCT FROM ({SEARCH_VECTOR_SQL})'
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [first_id, last_id])
+        return cursor.rowcount
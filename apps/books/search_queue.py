@@ -0,0 +1,94 @@
+"""
+Deferred search vector refreshes.
+
+With BOOKS_SEARCH_REFRESH_MODE = 'deferred', book writes only record the
+book id in the `books_search_queue` outbox table, in the same transaction
+as the change. The `process_search_queue` command drains it in batches,
+recomputing each batch with one set-based UPDATE, so bursts of edits to
+the same book coalesce into a single refresh.
+
+Deferred mode takes over from the search vector trigger: every PostgreSQL
+connection opened by the app sets `books.search_refresh_mode`, which the
+trigger function (migration 0007) checks before recomputing. Writers
+outside the app still get the trigger.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from apps.core.cache import books_cache
+from .models import SearchRefreshQueue
+from .search import invalidate_search_cache
+from .search_index import refresh_search_vectors, search_trigger_installed
+
+
+# Session setting read by the search vector trigger function
+SEARCH_REFRESH_MODE_SETTING = 'books.search_refresh_mode'
+
+
+def deferred_refresh_enabled():
+    """Check if search vector refreshes go through the queue."""
+    return getattr(settings, 'BOOKS_SEARCH_REFRESH_MODE', 'sync') == 'deferred'
+
+
+def trigger_maintains_search_vectors(using='default'):
+    """Check if the database trigger keeps search vectors current for the app."""
+    return search_trigger_installed(using) and not deferred_refresh_enabled()
+
+
+def configure_search_refresh_mode(connection):
+    """Tell the search trigger to skip this connection's writes in deferred mode."""
+    if connection.vendor == 'postgresql' and deferred_refresh_enabled():
+        with connection.cursor() as cursor:
+            # Session-wide on purpose: the mode is fixed for the process
+            cursor.execute("SELECT set_config(%s, 'deferred', false)", [SEARCH_REFRESH_MODE_SETTING])
+
+
+def schedule_search_refresh(ids, using='default'):
+    """
+    Bring the search vectors of `ids` (book ids or a Book queryset) up to date.
+
+    Queued in deferred mode; otherwise nothing to do where the database
+    trigger maintains them, and refreshed right away where it does not.
+    """
+    if deferred_refresh_enabled():
+        enqueue_search_refresh(ids, using=using)
+    elif not search_trigger_installed(using):
+        refresh_search_vectors(ids, using=using)
+
+
+def enqueue_search_refresh(ids, using='default'):
+    """Queue book ids; ids already waiting in the queue are skipped."""
+    if hasattr(ids, 'query'):
+        ids = ids.values_list('pk', flat=True)
+    SearchRefreshQueue.objects.using(using).bulk_create(
+        [SearchRefreshQueue(book_id=book_id) for book_id in ids],
+        ignore_conflicts=True,
+    )
+
+
+def drain_search_queue(batch_size=500, using='default'):
+    """
+    Refresh one batch of queued books and remove their queue entries.
+
+    Entries are claimed with SELECT ... FOR UPDATE SKIP LOCKED on
+    PostgreSQL, so several workers can drain the queue concurrently.
+    Returns the number of entries processed (0 when the queue is empty).
+    """
+    with transaction.atomic(using=using):
+        entries = list(
+            SearchRefreshQueue.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', 'book_id')[:batch_size]
+        )
+        if not entries:
+            return 0
+        refresh_search_vectors([book_id for _, book_id in entries], using=using)
+        SearchRefreshQueue.objects.using(using).filter(
+            id__in=[entry_id for entry_id, _ in entries]
+        ).delete()
+
+    # Ranked search results cached since the edit may now be stale
+    invalidate_search_cache()
+    books_cache.invalidate()
+    return len(entries)
@@ -1,22 +1,103 @@
 """
 Books app signals.
-Auto-update search vector when books are saved.
+Auto-update search vector when books are saved, and drop cached
+catalog data on every write.
 """
-from django.db.models.signals import post_save
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from .models import Book
+from .search import invalidate_search_cache
+from .search_index import SEARCH_FIELDS
+from .search_queue import configure_search_refresh_mode, schedule_search_refresh
+from apps.core.cache import books_cache
+
+# Pending work while signals are deferred, None otherwise
+_deferred = ContextVar('deferred_book_signals', default=None)
+
+# Fields written when a book is checked out or returned
+AVAILABILITY_FIELDS = ('is_available', 'updated_at')
+
+
+@contextmanager
+def deferred_book_signals():
+    """
+    Defer per-row signal work during bulk save()/delete() loops.
+
+    Inside the block the handlers only record which books changed; on
+    exit their search vectors are refreshed in one UPDATE per database
+    and cached catalog data is dropped once. Nested blocks join the
+    outermost one.
+    """
+    if _deferred.get() is not None:
+        yield
+        return
+    pending = {'ids': defaultdict(set), 'dirty': False, 'search_dirty': False}
+    token = _deferred.set(pending)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+        for using, ids in pending['ids'].items():
+            schedule_search_refresh(ids, using=using)
+        if pending['search_dirty']:
+            invalidate_search_cache()
+        if pending['dirty']:
+            books_cache.invalidate()
 
 
 @receiver(post_save, sender=Book)
-def update_book_search_vector(sender, instance, created, **kwargs):
+def update_book_search_vector(sender, instance, created, update_fields=None, **kwargs):
     """
     Update search vector after book save.
     This enables full-text search on PostgreSQL.
+
+    Skipped unless a searchable field was written and actually changed,
+    so availability flips from loans never re-index the book.
     """
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    if not created and not instance.search_fields_changed:
+        return
+
+    pending = _deferred.get()
+    if pending is not None:
+        pending['ids'][instance._state.db or 'default'].add(instance.pk)
+        return
     try:
-        # Use update() to avoid recursion
-        if not kwargs.get('update_fields') or 'search_vector' not in kwargs.get('update_fields', []):
-            instance.update_search_vector()
+        instance.update_search_vector()
     except Exception:
         # Silently fail for non-PostgreSQL databases
         pass
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_caches(sender, update_fields=None, **kwargs):
+    """
+    Cached search results and counts may include the changed book.
+    Bumping the books namespace also reaches other workers.
+
+    Saves limited to AVAILABILITY_FIELDS (checkouts and returns) keep the
+    ranked search results; only availability-filtered searches depend on
+    them, and those are keyed on the books generation too.
+    """
+    searchable = update_fields is None or not set(update_fields) <= set(AVAILABILITY_FIELDS)
+    pending = _deferred.get()
+    if pending is not None:
+        pending['dirty'] = True
+        pending['search_dirty'] |= searchable
+        return
+    if searchable:
+        invalidate_search_cache()
+    books_cache.invalidate()
+
+
+@receiver(connection_created)
+def set_search_refresh_mode(sender, connection, **kwargs):
+    """Hand search vector refreshes from the trigger to the queue in deferred mode."""
+    configure_search_refresh_mode(connection)
@@ -0,0 +1,17 @@
+"""
+Books app validators.
+"""
+from django.core.exceptions import ValidationError
+
+
+def normalize_isbn(value):
+    """
+    Strip hyphens and spaces from an ISBN and check its format.
+    Returns the normalized ISBN or raises ValidationError.
+    """
+    isbn = value.replace('-', '').replace(' ', '')
+    if len(isbn) not in [10, 13]:
+        raise ValidationError('ISBN must be 10 or 13 characters long.')
+    if not isbn.isdigit():
+        raise ValidationError('ISBN must contain only digits.')
+    return isbn
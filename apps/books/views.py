@@ -1,30 +1,41 @@
 """
 Books app views.
 """
+from functools import partial
+from django.db import transaction
 from rest_framework import viewsets
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .models import Book
-from .serializers import BookSerializer, BookListSerializer, BookCreateUpdateSerializer
+from .serializers import (
+    BookSerializer, BookListSerializer, BookListFastSerializer, BookCreateUpdateSerializer
+)
 from .filters import BookFilter
 from .search import BookSearchFilter
 from .ordering import CustomOrderingFilter
 from .pagination import CustomPageNumberPagination
+from .conditional import ConditionalGetMixin
+from .response_cache import AnonymousResponseCacheMixin
 from apps.accounts.permissions import IsAdministratorOrReadOnly
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(AnonymousResponseCacheMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     Book Catalog API - Search, filter, and browse books
     
     Public: Browse books
     Admin: Full CRUD access
+
+    List reads send an ETag and detail reads ETag / Last-Modified, and
+    both answer conditional requests with 304 Not Modified; anonymous
+    reads are served from the response cache.
     """
     
     queryset = Book.objects.all()
     permission_classes = [IsAdministratorOrReadOnly]
-    filter_backends = [BookSearchFilter, DjangoFilterBackend, CustomOrderingFilter]
+    filter_backends = [DjangoFilterBackend, BookSearchFilter, CustomOrderingFilter]
     filterset_class = BookFilter
     search_fields = ['title', 'author', 'description', 'isbn', 'genre']
     ordering_fields = ['title', 'author', 'created_at', 'published_date']
@@ -47,7 +58,10 @@ class BookViewSet(viewsets.ModelViewSet):
             openapi.Parameter(
                 'search',
                 openapi.IN_QUERY,
-                description="Search books (fuzzy matching, handles typos)",
+                description=(
+                    "Search books (fuzzy matching, handles typos). Results are ranked by "
+                    "relevance and capped at twice BOOKS_SEARCH_CANDIDATE_LIMIT (400 by default)."
+                ),
                 type=openapi.TYPE_STRING,
                 required=False,
             ),
@@ -125,7 +139,25 @@ class BookViewSet(viewsets.ModelViewSet):
         filter_inspectors=[],  # Disable auto-generation to control order
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.cached_read(
+            request,
+            partial(self.get_list_validators, request),
+            partial(self.render_list, request),
+        )
+
+    def render_list(self, request):
+        """
+        ListModelMixin.list over `.values()` rows and BookListFastSerializer.
+        Ordering fields are selected too so keyset cursors can be built.
+        """
+        queryset = self.get_filtered_queryset()
+        fields = dict.fromkeys(BookListFastSerializer.values_fields + tuple(self.ordering_fields))
+        rows = queryset.values(*fields)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(BookListFastSerializer.serialize(page))
+        return Response(BookListFastSerializer.serialize(rows))
 
     @swagger_auto_schema(operation_id="CreateBook", operation_summary="Add New Book (Admin)")
     def create(self, request, *args, **kwargs):
@@ -133,7 +165,11 @@ class BookViewSet(viewsets.ModelViewSet):
 
     @swagger_auto_schema(operation_id="GetBook", operation_summary="Get Book Details")
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        return self.cached_read(
+            request,
+            partial(self.get_detail_validators, kwargs[self.lookup_field]),
+            partial(super().retrieve, request, *args, **kwargs),
+        )
 
     @swagger_auto_schema(operation_id="UpdateBook", operation_summary="Update Book (Admin)")
     def update(self, request, *args, **kwargs):
@@ -146,19 +182,13 @@ class BookViewSet(viewsets.ModelViewSet):
     @swagger_auto_schema(operation_id="DeleteBook", operation_summary="Remove Book (Admin)")
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
-    
+
     def perform_create(self, serializer):
-        """Create book and update search vector."""
-        book = serializer.save()
-        try:
-            book.update_search_vector()
-        except Exception:
-            pass
-    
+        """Save the book and its search refresh queue entry together."""
+        with transaction.atomic():
+            serializer.save()
+
     def perform_update(self, serializer):
-        """Update book and refresh search vector."""
-        book = serializer.save()
-        try:
-            book.update_search_vector()
-        except Exception:
-            pass
+        """Save the book and its search refresh queue entry together."""
+        with transaction.atomic():
+            serializer.save()
@@ -0,0 +1,125 @@
+"""
+Namespaced facade over the shared Django cache.
+
+Each app gets its own namespace (`books`, `loans`, `accounts`) with a
+generation counter stored in the cache itself, so one app can drop all
+of its keys at once without touching the others or scanning keys:
+
+    from apps.core.cache import books_cache
+
+    books_cache.set('count:abc', 42, timeout=30)
+    books_cache.invalidate()  # every books key is now a miss
+
+Inside generation_scope() (opened per request by
+CacheGenerationMiddleware) each namespace's generation is read from the
+cache once and reused, so later get()/set() calls cost one round trip.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Generation keys never expire on their own
+GENERATION_TIMEOUT = None
+
+# Generations read in the current scope, None outside one
+_generations = ContextVar('cache_generations', default=None)
+
+
+@contextmanager
+def generation_scope():
+    """Memoize namespace generations until the block exits."""
+    token = _generations.set({})
+    try:
+        yield
+    finally:
+        _generations.reset(token)
+
+
+def cache_is_shared():
+    """Check if every worker sees the same cache (CACHE_IS_SHARED)."""
+    return getattr(settings, 'CACHE_IS_SHARED', False)
+
+
+def cache_has_atomic_incr():
+    """Check if incr()/add() are atomic across workers (CACHE_HAS_ATOMIC_INCR)."""
+    return getattr(settings, 'CACHE_HAS_ATOMIC_INCR', False)
+
+
+class AppCache:
+    """Namespaced, invalidatable view of a configured cache."""
+
+    def __init__(self, namespace, alias='default'):
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def generation_key(self):
+        return f'{self.namespace}:generation'
+
+    @property
+    def generation(self):
+        """Current namespace generation; changes on every invalidate()."""
+        memo = _generations.get()
+        memo_key = (self.alias, self.namespace)
+        if memo is not None and memo_key in memo:
+            return memo[memo_key]
+        generation = self.backend.get(self.generation_key)
+        if generation is None:
+            # Start from the clock so an evicted counter never reuses
+            # a generation that still has live keys
+            self.backend.add(self.generation_key, time.time_ns(), timeout=GENERATION_TIMEOUT)
+            generation = self.backend.get(self.generation_key)
+        if memo is not None:
+            memo[memo_key] = generation
+        return generation
+
+    def make_key(self, key):
+        return f'{self.namespace}:{self.generation}:{key}'
+
+    def get(self, key, default=None):
+        return self.backend.get(self.make_key(key), default)
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            self.backend.set(self.make_key(key), value)
+        else:
+            self.backend.set(self.make_key(key), value, timeout)
+
+    def delete(self, key):
+        self.backend.delete(self.make_key(key))
+
+    def get_or_set(self, key, default, timeout=None):
+        """Return the cached value, computing and storing `default()` on a miss."""
+        full_key = self.make_key(key)
+        value = self.backend.get(full_key)
+        if value is None:
+            value = default() if callable(default) else default
+            if timeout is None:
+                self.backend.set(full_key, value)
+            else:
+                self.backend.set(full_key, value, timeout)
+        return value
+
+    def invalidate(self):
+        """Orphan every key in this namespace by bumping its generation."""
+        try:
+            generation = self.backend.incr(self.generation_key)
+        except ValueError:
+            # Generation missing (evicted or never set)
+            generation = time.time_ns()
+            self.backend.set(self.generation_key, generation, timeout=GENERATION_TIMEOUT)
+        memo = _generations.get()
+        if memo is not None:
+            memo[(self.alias, self.namespace)] = generation
+
+
+books_cache = AppCache('books')
+loans_cache = AppCache('loans')
+accounts_cache = AppCache('accounts')
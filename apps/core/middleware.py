@@ -0,0 +1,20 @@
+"""
+Core middleware.
+"""
+from .cache import generation_scope
+
+
+class CacheGenerationMiddleware:
+    """
+    Read each cache namespace's generation once per request.
+
+    Writes made by the request itself are seen immediately; invalidations
+    from other workers apply from the next request on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with generation_scope():
+            return self.get_response(request)
@@ -0,0 +1,195 @@
+"""
+Pagination shared by the apps.
+"""
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with opaque signed cursors.
+
+    Instead of OFFSET scans and COUNT(*), each page seeks past the last
+    row of the previous one on the active ordering, with `id` as the
+    tie-breaker, so deep pages cost the same as the first one.
+
+    Query parameters:
+    - cursor: Opaque cursor from a previous response (empty for first page)
+    - page_size: Items per page (default: 10, max: 100)
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    default_ordering = ('-created_at',)
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+    signing_salt = 'apps.core.pagination.keyset'
+
+    def get_page_size(self, request):
+        """Return the requested page size, bounded by max_page_size."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Ordering to seek on.
+
+        Uses the ordering already applied to the queryset (by the view's
+        ordering filter), keeping only plain fields listed in the view's
+        `ordering_fields`. Falls back to the view's default ordering.
+        """
+        allowed = getattr(view, 'ordering_fields', None) or ()
+        ordering = [
+            field for field in queryset.query.order_by
+            if isinstance(field, str) and field.lstrip('-') in allowed
+        ]
+        return ordering or list(getattr(view, 'ordering', None) or self.default_ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        if self.tiebreaker not in [field.lstrip('-') for field in self.ordering]:
+            self.ordering = self.ordering + [self.tiebreaker]
+
+        model = queryset.model
+        self.keys = [
+            (field.lstrip('-'), field.startswith('-'), model._meta.get_field(field.lstrip('-')))
+            for field in self.ordering
+        ]
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor['d'] == 'p'
+
+        if cursor is not None:
+            queryset = queryset.filter(self._seek_filter(cursor['p'], reverse))
+        queryset = queryset.order_by(*self._order_expressions(reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        """Same envelope as page-number pagination, minus the counts."""
+        return Response({
+            'page_size': self.page_size,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.rows:
+            return None
+        return self._link(self.rows[-1], 'n')
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.rows:
+            return None
+        return self._link(self.rows[0], 'p')
+
+    def decode_cursor(self, request):
+        """Decode and verify the cursor; None means the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = signing.loads(encoded, salt=self.signing_salt)
+            position = cursor['p']
+            if cursor['o'] != self.ordering or cursor['d'] not in ('n', 'p'):
+                raise ValueError
+            if len(position) != len(self.keys):
+                raise ValueError
+            cursor['p'] = [
+                None if value is None else field.to_python(value)
+                for value, (_, _, field) in zip(position, self.keys)
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, position, direction):
+        return signing.dumps(
+            {'o': self.ordering, 'p': position, 'd': direction},
+            salt=self.signing_salt,
+            compress=True,
+        )
+
+    def _link(self, row, direction):
+        position = []
+        for name, _, _ in self.keys:
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            position.append(value)
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, direction))
+
+    def _order_expressions(self, reverse):
+        """
+        Forward order puts NULLs last in both directions; walking backwards
+        is the exact mirror image of it.
+        """
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        expressions = []
+        for name, descending, _ in self.keys:
+            if descending != reverse:
+                expressions.append(F(name).desc(**nulls))
+            else:
+                expressions.append(F(name).asc(**nulls))
+        return expressions
+
+    def _seek_filter(self, position, reverse):
+        """
+        Build `(k1, k2, ...) > (v1, v2, ...)` in the active ordering,
+        expanded so mixed directions and nullable keys are handled.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending, field), value in zip(self.keys, position):
+            beyond = self._beyond(name, descending, field, value, reverse)
+            if beyond is not None:
+                condition |= equal & beyond
+            if value is None:
+                equal &= Q(**{f'{name}__isnull': True})
+            else:
+                equal &= Q(**{name: value})
+        return condition
+
+    def _beyond(self, name, descending, field, value, reverse):
+        """
+        Rows strictly after `value` on one key (before it when reversed),
+        or None when no row can be.
+        """
+        if not reverse:
+            if value is None:
+                return None
+            beyond = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            if field.null:
+                beyond |= Q(**{f'{name}__isnull': True})
+            return beyond
+        if value is None:
+            return Q(**{f'{name}__isnull': False})
+        return Q(**{f'{name}__{"gt" if descending else "lt"}': value})
@@ -2,6 +2,7 @@
 Loans app admin configuration.
 """
 from django.contrib import admin
+from .checkout import reconcile_active_loan_counts
 from .models import Loan
 
 
@@ -17,6 +18,12 @@ class LoanAdmin(admin.ModelAdmin):
     date_hierarchy = 'borrowed_at'
     list_per_page = 25
 
+    def save_model(self, request, obj, form, change):
+        """Admin writes bypass checkout, so recount the affected users' loans."""
+        previous_user_id = form.initial.get('user')
+        super().save_model(request, obj, form, change)
+        reconcile_active_loan_counts({obj.user_id, previous_user_id} - {None})
+
     def loan_status(self, obj):
         """Display loan status."""
         if obj.returned_at:
@@ -8,3 +8,7 @@ class LoansConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.loans'
     verbose_name = 'Loans'
+
+    def ready(self):
+        """Import signals when app is ready."""
+        import apps.loans.signals  # noqa: F401
@@ -0,0 +1,142 @@
+"""
+Checkout engine.
+
+A checkout is three statements in one short transaction:
+1. Reserve a borrowing slot: a conditional UPDATE that increments
+   `users.active_loan_count` only while it is below the user's limit.
+2. Claim the book with a conditional UPDATE that only matches while it
+   is still available (RETURNING the row for the response).
+3. Insert the loan. The `loan_one_active_per_book` partial unique index
+   rejects a second active loan for the same book and rolls it all back.
+
+No row lock is held across round trips. Extra queries run only on the
+failure path, to pick the error message.
+
+Writes that bypass checkout and return_loan keep the counter in step
+too: deleting an active loan (directly or through its book or user)
+frees its slot, and admin edits recount the affected users with
+reconcile_active_loan_counts().
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.accounts.roles import get_roles
+from apps.books.models import Book
+from apps.books.signals import AVAILABILITY_FIELDS, invalidate_book_caches
+from .models import Loan
+
+
+class CheckoutError(Exception):
+    """Checkout refused; `detail` is the 400 response body."""
+
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def borrowing_limit(user):
+    """Maximum active loans for a user: the highest limit among their groups."""
+    limits = getattr(settings, 'LOANS_BORROWING_LIMITS', {})
+    group_limits = [limits[name] for name in get_roles(user) if name in limits]
+    return max(group_limits, default=getattr(settings, 'LOANS_DEFAULT_BORROWING_LIMIT', 1))
+
+
+def reserve_loan_slot(user, limit):
+    """Count a new active loan against the user's limit; False when it is full."""
+    return get_user_model().objects.filter(
+        pk=user.pk, active_loan_count__lt=limit
+    ).update(active_loan_count=F('active_loan_count') + 1) == 1
+
+
+def release_loan_slot(user_id):
+    """Give back a slot taken by reserve_loan_slot."""
+    get_user_model().objects.filter(
+        pk=user_id, active_loan_count__gt=0
+    ).update(active_loan_count=F('active_loan_count') - 1)
+
+
+def reconcile_active_loan_counts(user_ids=None):
+    """
+    Recompute `users.active_loan_count` from the loans table, for
+    `user_ids` or every user. Returns the number of users updated.
+    """
+    active = (
+        Loan.objects.filter(user=OuterRef('pk'), returned_at__isnull=True)
+        .order_by().values('user').annotate(count=Count('pk')).values('count')
+    )
+    users = get_user_model().objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    return users.update(active_loan_count=Coalesce(Subquery(active), 0))
+
+
+def claim_book(book_id):
+    """Mark an available book as borrowed; returns the Book or None."""
+    columns = ', '.join(
+        field.column for field in Book._meta.concrete_fields if field.name != 'search_vector'
+    )
+    claimed = Book.objects.raw(
+        f'UPDATE {Book._meta.db_table} SET is_available = %s, updated_at = %s '
+        f'WHERE id = %s AND is_available = %s RETURNING {columns}',
+        [False, timezone.now(), book_id, True],
+    )
+    return next(iter(claimed), None)
+
+
+def checkout_book(user, book_id, due_date=None):
+    """Borrow a book for `user`; returns the new Loan or raises CheckoutError."""
+    limit = borrowing_limit(user)
+    try:
+        with transaction.atomic():
+            if not reserve_loan_slot(user, limit):
+                raise CheckoutError(limit_detail(user, book_id, limit))
+            book = claim_book(book_id)
+            if book is None:
+                raise CheckoutError(unavailable_detail(user, book_id))
+            loan = Loan.objects.create(user_id=user.pk, book=book, due_date=due_date)
+    except IntegrityError:
+        raise CheckoutError(unavailable_detail(user, book_id))
+
+    # The raw UPDATE skips post_save; listings show availability
+    invalidate_book_caches(sender=Book, update_fields=AVAILABILITY_FIELDS)
+    return loan
+
+
+def return_loan(loan):
+    """
+    Close an active loan, free its book and the user's borrowing slot.
+    Returns False if the loan had already been returned.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        if not Loan.objects.filter(pk=loan.pk, returned_at__isnull=True).update(returned_at=now):
+            return False
+        release_loan_slot(loan.user_id)
+        loan.book.is_available = True
+        loan.book.save(update_fields=AVAILABILITY_FIELDS)
+    loan.returned_at = now
+    return True
+
+
+def limit_detail(user, book_id, limit):
+    # A missing or already borrowed book is reported before the limit
+    return book_detail(user, book_id) or {
+        'error': f"You can only borrow {limit} book{'s' if limit != 1 else ''} at a time."
+    }
+
+
+def unavailable_detail(user, book_id):
+    return book_detail(user, book_id) or {'error': 'Book is not available.'}
+
+
+def book_detail(user, book_id):
+    """Error about the requested book itself, or None."""
+    if not Book.objects.filter(pk=book_id).exists():
+        return {'book_id': ['Book not found.']}
+    if Loan.objects.filter(user_id=user.pk, book_id=book_id, returned_at__isnull=True).exists():
+        return {'error': 'You already have this book.'}
+    return None
@@ -0,0 +1,61 @@
+"""
+Streaming loan export (NDJSON / CSV).
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from .serializers import LoanFastSerializer
+
+CSV_COLUMNS = [
+    'id', 'user_email', 'book_id', 'book_title', 'book_isbn',
+    'borrowed_at', 'due_date', 'returned_at', 'is_active', 'is_overdue',
+]
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+    """Pseudo-buffer that hands each written line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_loan_rows(queryset):
+    """
+    Yield serialized loans from a server-side cursor, one chunk at a time,
+    so memory stays flat regardless of the number of rows.
+    """
+    chunk_size = getattr(settings, 'LOANS_EXPORT_CHUNK_SIZE', 2000)
+    rows = queryset.values(*LoanFastSerializer.values_fields).iterator(chunk_size=chunk_size)
+    now = timezone.now()
+    for row in rows:
+        yield LoanFastSerializer.to_representation(row, now)
+
+
+def stream_ndjson(queryset):
+    for loan in iter_loan_rows(queryset):
+        yield json.dumps(loan, separators=(',', ':')) + '\n'
+
+
+def stream_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for loan in iter_loan_rows(queryset):
+        book = loan['book']
+        yield writer.writerow([
+            loan['id'], loan['user_email'], book['id'], book['title'], book['isbn'],
+            loan['borrowed_at'], loan['due_date'], loan['returned_at'] or '',
+            loan['is_active'], loan['is_overdue'],
+        ])
+
+
+STREAMERS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+}
@@ -0,0 +1,18 @@
+"""
+Management command to recompute every user's active loan counter.
+
+Checkout, return_loan, loan deletes and admin edits keep
+users.active_loan_count in step; run this after writing loans any
+other way (raw SQL, shell, data imports) to repair drifted counts.
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Recompute users.active_loan_count from active loans'
+
+    def handle(self, *args, **options):
+        from apps.loans.checkout import reconcile_active_loan_counts
+
+        updated = reconcile_active_loan_counts()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled active loan counts for {updated} users.'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-18 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='loan',
+            constraint=models.UniqueConstraint(condition=models.Q(('returned_at__isnull', True)), fields=('user',), name='loan_one_active_per_user'),
+        ),
+    ]
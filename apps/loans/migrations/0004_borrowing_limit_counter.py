@@ -0,0 +1,31 @@
+# Per-user limits move from a partial unique index to User.active_loan_count
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_active_loan_counts(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    Loan = apps.get_model('loans', 'Loan')
+    active = (
+        Loan.objects.filter(user=OuterRef('pk'), returned_at__isnull=True)
+        .order_by().values('user').annotate(count=Count('pk')).values('count')
+    )
+    User.objects.update(active_loan_count=Coalesce(Subquery(active), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_active_loan_count'),
+        ('loans', '0003_loan_one_active_per_book'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='loan',
+            name='loan_one_active_per_user',
+        ),
+        migrations.RunPython(backfill_active_loan_counts, migrations.RunPython.noop),
+    ]
@@ -36,6 +36,15 @@ class Loan(models.Model):
             models.Index(fields=['user', 'returned_at']),
             models.Index(fields=['book', 'returned_at']),
         ]
+        constraints = [
+            # At most one active loan per book; checkout and manual creation
+            # rely on it. Per-user limits use User.active_loan_count.
+            models.UniqueConstraint(
+                fields=['book'],
+                condition=models.Q(returned_at__isnull=True),
+                name='loan_one_active_per_book',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         # Set default due_date if not provided
@@ -0,0 +1,22 @@
+"""
+Loans app pagination.
+"""
+from apps.core.pagination import KeysetPagination
+
+
+class LoanCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for loan lists.
+
+    Seeks on the endpoint's ordering (`borrowed_at` or `due_date`, with
+    `id` as tie-breaker), so memory and latency stay flat however large
+    the loans table grows.
+
+    Query parameters:
+    - cursor: Opaque cursor from a previous response
+    - page_size: Items per page (default: 20, max: 100)
+    """
+    page_size = 20
+    max_page_size = 100
+    default_ordering = ('-borrowed_at',)
+    signing_salt = 'apps.loans.pagination.keyset'
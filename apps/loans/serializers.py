@@ -1,10 +1,13 @@
 """
 Loans app serializers.
 """
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Loan
+from apps.accounts.roles import is_administrator
 from apps.books.serializers import BookListSerializer
-from apps.books.models import Book
 
 
 class LoanSerializer(serializers.ModelSerializer):
@@ -24,6 +27,53 @@ class LoanSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'borrowed_at', 'returned_at']
 
 
+class LoanFastSerializer:
+    """
+    Fast path for LoanSerializer.
+
+    Builds rows straight from `.values(*values_fields)` dicts, including
+    the nested book, `user_email` and the computed `is_active` /
+    `is_overdue`. Output is identical to LoanSerializer(many=True).data.
+    """
+    values_fields = (
+        'id', 'user__email',
+        'book__id', 'book__title', 'book__author', 'book__isbn', 'book__genre', 'book__is_available',
+        'borrowed_at', 'due_date', 'returned_at',
+    )
+    # Same formatting (timezone, ISO 8601, trailing Z) as the model serializer
+    _datetime = staticmethod(serializers.DateTimeField().to_representation)
+
+    @classmethod
+    def to_representation(cls, row, now=None):
+        now = now or timezone.now()
+        returned_at = row['returned_at']
+        due_date = row['due_date']
+        datetime = cls._datetime
+        return {
+            'id': row['id'],
+            'user_email': row['user__email'],
+            'book': {
+                'id': row['book__id'],
+                'title': row['book__title'],
+                'author': row['book__author'],
+                'isbn': row['book__isbn'],
+                'genre': row['book__genre'],
+                'is_available': row['book__is_available'],
+            },
+            'borrowed_at': datetime(row['borrowed_at']),
+            'due_date': datetime(due_date),
+            'returned_at': datetime(returned_at),
+            'is_active': returned_at is None,
+            'is_overdue': returned_at is None and now > due_date,
+        }
+
+    @classmethod
+    def serialize(cls, rows):
+        now = timezone.now()
+        to_representation = cls.to_representation
+        return [to_representation(row, now) for row in rows]
+
+
 class LoanDetailSerializer(serializers.ModelSerializer):
     """Detailed serializer for single loan view."""
 
@@ -42,22 +92,55 @@ class LoanDetailSerializer(serializers.ModelSerializer):
 
 
 class BorrowBookSerializer(serializers.Serializer):
-    """Serializer for borrowing a book."""
+    """
+    Serializer for borrowing a book.
+    Existence and availability are checked by the checkout itself.
+    """
 
     book_id = serializers.IntegerField()
 
-    def validate_book_id(self, value):
-        try:
-            book = Book.objects.get(pk=value)
-        except Book.DoesNotExist:
-            raise serializers.ValidationError('Book not found.')
-
-        if not book.is_available:
-            raise serializers.ValidationError('Book is not available for borrowing.')
 
+class LoanCreateSerializer(BorrowBookSerializer):
+    """
+    Serializer for manual loan creation.
+    Members may only shorten the loan period; administrators may set any
+    future due date.
+    """
+
+    due_date = serializers.DateTimeField(required=False)
+
+    def validate_due_date(self, value):
+        now = timezone.now()
+        if value <= now:
+            raise serializers.ValidationError('Due date must be in the future.')
+        request = self.context.get('request')
+        if value > now + timedelta(days=Loan.DEFAULT_LOAN_DAYS) and not (
+            request and is_administrator(request.user)
+        ):
+            raise serializers.ValidationError(
+                f'Due date must be within {Loan.DEFAULT_LOAN_DAYS} days.'
+            )
         return value
 
 
+class LoanExportFilterSerializer(serializers.Serializer):
+    """Query parameters for the loan export."""
+
+    output = serializers.ChoiceField(choices=['ndjson', 'csv'], default='ndjson')
+    borrowed_from = serializers.DateField(required=False)
+    borrowed_to = serializers.DateField(required=False)
+    overdue = serializers.BooleanField(required=False, allow_null=True, default=None)
+    user_id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('borrowed_from') and attrs.get('borrowed_to'):
+            if attrs['borrowed_from'] > attrs['borrowed_to']:
+                raise serializers.ValidationError({
+                    'borrowed_to': 'Must not be before borrowed_from.'
+                })
+        return attrs
+
+
 class EmptySerializer(serializers.Serializer):
     """Empty serializer for endpoints that don't need a request body."""
     pass
@@ -0,0 +1,16 @@
+"""
+Loans app signals.
+Keep users.active_loan_count in step with loans deleted outside
+return_loan, including cascades from a deleted book or user.
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .checkout import release_loan_slot
+from .models import Loan
+
+
+@receiver(post_delete, sender=Loan)
+def release_slot_of_deleted_loan(sender, instance, **kwargs):
+    """Free the borrowing slot held by a deleted active loan."""
+    if instance.returned_at is None:
+        release_loan_slot(instance.user_id)
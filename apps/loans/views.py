@@ -5,14 +5,21 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from datetime import datetime, time, timedelta
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from django.db import transaction
 from drf_yasg.utils import swagger_auto_schema, no_body
 from drf_yasg import openapi
 from .models import Loan
-from .serializers import LoanSerializer, LoanDetailSerializer, BorrowBookSerializer, EmptySerializer
-from apps.books.models import Book
-from apps.accounts.permissions import IsAdministrator, IsOwnerOrAdministrator
+from .pagination import LoanCursorPagination
+from .serializers import (
+    LoanSerializer, LoanDetailSerializer, LoanFastSerializer, BorrowBookSerializer,
+    LoanCreateSerializer, LoanExportFilterSerializer
+)
+from .checkout import CheckoutError, checkout_book, return_loan
+from .export import CONTENT_TYPES, STREAMERS
+from apps.accounts.permissions import IsAdministrator
+from apps.accounts.roles import is_administrator
 
 
 class LoanViewSet(viewsets.ModelViewSet):
@@ -21,12 +28,16 @@ class LoanViewSet(viewsets.ModelViewSet):
     
     Members: Borrow books, view loans
     Administrators: Manage all loans
+
+    Loan lists are cursor-paginated on their ordering.
     """
     serializer_class = LoanSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ['get', 'post']
     filter_backends = []
-    pagination_class = None
+    pagination_class = LoanCursorPagination
+    # Orderings the cursor paginator may seek on
+    ordering_fields = ['borrowed_at', 'due_date']
 
     def get_queryset(self):
         """Filter loans by user role."""
@@ -36,15 +47,25 @@ class LoanViewSet(viewsets.ModelViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return Loan.objects.none()
         
-        if user.groups.filter(name='Administrators').exists():
+        if is_administrator(user):
             return queryset.order_by('-borrowed_at')
-        return queryset.filter(user=user).order_by('-borrowed_at')
+        return queryset.filter(user_id=user.pk).order_by('-borrowed_at')
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return LoanDetailSerializer
+        if self.action == 'create':
+            return LoanCreateSerializer
         return LoanSerializer
 
+    def fast_response(self, queryset):
+        """Paginate a loan queryset and serialize it through LoanFastSerializer."""
+        rows = queryset.values(*LoanFastSerializer.values_fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(LoanFastSerializer.serialize(page))
+        return Response(LoanFastSerializer.serialize(rows))
+
     @swagger_auto_schema(
         operation_id="ListLoans",
         operation_summary="List loans",
@@ -53,7 +74,7 @@ class LoanViewSet(viewsets.ModelViewSet):
         manual_parameters=[]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.fast_response(self.get_queryset())
 
     @swagger_auto_schema(
         operation_id="CreateLoanManual",
@@ -61,7 +82,16 @@ class LoanViewSet(viewsets.ModelViewSet):
         operation_description="Manually create a loan record (Alternative to Checkout)"
     )
     def create(self, request, *args, **kwargs):
-        return super().create(request, *args, **kwargs)
+        """Create a loan for the current user, with the checkout's checks."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            loan = checkout_book(request.user, **serializer.validated_data)
+        except CheckoutError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(LoanSerializer(loan).data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
         operation_id="GetLoan",
@@ -92,27 +122,11 @@ class LoanViewSet(viewsets.ModelViewSet):
         """Borrow a book by ID."""
         serializer = BorrowBookSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        book_id = serializer.validated_data['book_id']
-
-        with transaction.atomic():
-            try:
-                book = Book.objects.select_for_update().get(pk=book_id)
-            except Book.DoesNotExist:
-                return Response({'error': 'Book not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-            if not book.is_available:
-                return Response({'error': 'Book is not available.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            if Loan.objects.filter(user=request.user, book=book, returned_at__isnull=True).exists():
-                return Response({'error': 'You already have this book.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Limit: 1 book at a time
-            if Loan.objects.filter(user=request.user, returned_at__isnull=True).exists():
-                return Response({'error': 'You can only borrow 1 book at a time.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            loan = Loan.objects.create(user=request.user, book=book)
-            book.is_available = False
-            book.save()
+        try:
+            loan = checkout_book(request.user, serializer.validated_data['book_id'])
+        except CheckoutError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(LoanSerializer(loan).data, status=status.HTTP_201_CREATED)
 
@@ -132,15 +146,9 @@ class LoanViewSet(viewsets.ModelViewSet):
         """Return a borrowed book (Admin only)."""
         loan = self.get_object()
 
-        if loan.returned_at:
+        if loan.returned_at or not return_loan(loan):
             return Response({'error': 'Book already returned.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            loan.returned_at = timezone.now()
-            loan.save()
-            loan.book.is_available = True
-            loan.book.save()
-
         return Response(LoanSerializer(loan).data)
 
     @swagger_auto_schema(
@@ -152,8 +160,7 @@ class LoanViewSet(viewsets.ModelViewSet):
     def current(self, request):
         """Get active loans."""
         queryset = self.get_queryset().filter(returned_at__isnull=True)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.fast_response(queryset)
 
     @swagger_auto_schema(
         operation_id="ListAllLoansAdmin",
@@ -163,9 +170,8 @@ class LoanViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAdministrator])
     def all_loans(self, request):
         """Get all loans (Admin only)."""
-        queryset = Loan.objects.select_related('user', 'book').order_by('-borrowed_at')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = Loan.objects.order_by('-borrowed_at')
+        return self.fast_response(queryset)
 
     @swagger_auto_schema(
         operation_id="ListOverdueLoans",
@@ -178,9 +184,41 @@ class LoanViewSet(viewsets.ModelViewSet):
         queryset = Loan.objects.filter(
             returned_at__isnull=True,
             due_date__lt=timezone.now()
-        ).select_related('user', 'book').order_by('-due_date')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        ).order_by('-due_date')
+        return self.fast_response(queryset)
+
+    @swagger_auto_schema(
+        operation_id="ExportLoansAdmin",
+        operation_summary="Export loans (Admin)",
+        operation_description="Stream loans as NDJSON or CSV - admin only",
+        query_serializer=LoanExportFilterSerializer,
+        responses={200: "Streamed NDJSON or CSV"}
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdministrator])
+    def export(self, request):
+        """Stream loans with optional date range, overdue and user filters (Admin only)."""
+        params = LoanExportFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        queryset = Loan.objects.order_by('id')
+        tz = timezone.get_current_timezone()
+        if filters.get('borrowed_from'):
+            start = datetime.combine(filters['borrowed_from'], time.min)
+            queryset = queryset.filter(borrowed_at__gte=timezone.make_aware(start, tz))
+        if filters.get('borrowed_to'):
+            end = datetime.combine(filters['borrowed_to'] + timedelta(days=1), time.min)
+            queryset = queryset.filter(borrowed_at__lt=timezone.make_aware(end, tz))
+        if filters.get('user_id'):
+            queryset = queryset.filter(user_id=filters['user_id'])
+        if filters['overdue'] is not None:
+            overdue = {'returned_at__isnull': True, 'due_date__lt': timezone.now()}
+            queryset = queryset.filter(**overdue) if filters['overdue'] else queryset.exclude(**overdue)
+
+        output = filters['output']
+        response = StreamingHttpResponse(STREAMERS[output](queryset), content_type=CONTENT_TYPES[output])
+        response['Content-Disposition'] = f'attachment; filename="loans.{output}"'
+        return response
 
     @swagger_auto_schema(
         operation_id="MyLoanHistory",
@@ -190,6 +228,5 @@ class LoanViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def history(self, request):
         """Get user's loan history."""
-        queryset = Loan.objects.filter(user=request.user).select_related('book').order_by('-borrowed_at')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = Loan.objects.filter(user_id=request.user.pk).order_by('-borrowed_at')
+        return self.fast_response(queryset)
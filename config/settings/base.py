@@ -6,6 +6,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -24,6 +26,7 @@ INSTALLED_APPS = [
     # Third-party apps
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'django_filters',
     'drf_yasg',
     'corsheaders',
@@ -37,6 +40,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.core.middleware.CacheGenerationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,6 +88,38 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing profiles (argon2 needs the argon2-cffi package)
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': 'apps.accounts.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'apps.accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'apps.accounts.hashers.Argon2PasswordHasher',
+}
+# New and rehashed passwords use this profile; the others still verify and
+# are upgraded on the user's next login
+ACCOUNTS_PASSWORD_HASHER = os.getenv('ACCOUNTS_PASSWORD_HASHER', 'pbkdf2')
+if ACCOUNTS_PASSWORD_HASHER not in PASSWORD_HASHER_PROFILES:
+    raise ImproperlyConfigured(
+        f"ACCOUNTS_PASSWORD_HASHER must be one of {', '.join(PASSWORD_HASHER_PROFILES)}, "
+        f"not {ACCOUNTS_PASSWORD_HASHER!r}."
+    )
+if ACCOUNTS_PASSWORD_HASHER == 'argon2':
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            'ACCOUNTS_PASSWORD_HASHER=argon2 needs the argon2-cffi package (pip install argon2-cffi).'
+        )
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[ACCOUNTS_PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_PROFILES.items() if name != ACCOUNTS_PASSWORD_HASHER
+]
+# Hashing cost; pick values with `python manage.py benchmark_hashers`
+ACCOUNTS_PBKDF2_ITERATIONS = int(os.getenv('ACCOUNTS_PBKDF2_ITERATIONS', '600000'))
+ACCOUNTS_SCRYPT_WORK_FACTOR = int(os.getenv('ACCOUNTS_SCRYPT_WORK_FACTOR', '16384'))
+ACCOUNTS_SCRYPT_BLOCK_SIZE = int(os.getenv('ACCOUNTS_SCRYPT_BLOCK_SIZE', '8'))
+ACCOUNTS_ARGON2_TIME_COST = int(os.getenv('ACCOUNTS_ARGON2_TIME_COST', '2'))
+ACCOUNTS_ARGON2_MEMORY_COST = int(os.getenv('ACCOUNTS_ARGON2_MEMORY_COST', '102400'))
+ACCOUNTS_ARGON2_PARALLELISM = int(os.getenv('ACCOUNTS_ARGON2_PARALLELISM', '8'))
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -125,6 +161,82 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
 }
 
+# Cache Configuration
+# CACHE_BACKEND selects the shared cache used by every worker:
+# - locmem: per-process memory (default, single worker)
+# - file: directory shared by workers on one host (CACHE_LOCATION)
+# - redis: any Redis-compatible server (CACHE_LOCATION; needs the optional
+#   `redis` package, which is not in requirements.txt)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'library-cache'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://localhost:6379/1'),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}, not {CACHE_BACKEND!r}."
+    )
+# Whether every worker sees the same cache; process-local caches that
+# depend on cross-worker invalidation are only trusted when it is
+CACHE_IS_SHARED = CACHE_BACKEND != 'locmem'
+# Whether incr()/add() are atomic across workers; the file backend
+# implements them as read-modify-write, so concurrent callers can collide
+CACHE_HAS_ATOMIC_INCR = CACHE_BACKEND == 'redis'
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'library'),
+        # Bump to invalidate every cached value after an incompatible deploy
+        'VERSION': int(os.getenv('CACHE_VERSION', '1')),
+        'TIMEOUT': 300,
+    }
+}
+
+# Book catalog listing
+# Above this many (estimated) rows, list responses report the PostgreSQL
+# planner estimate instead of running an exact COUNT(*)
+BOOKS_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('BOOKS_COUNT_ESTIMATE_THRESHOLD', '100000'))
+# Seconds an exact count is reused for the same filters
+BOOKS_COUNT_CACHE_TTL = int(os.getenv('BOOKS_COUNT_CACHE_TTL', '30'))
+# Candidates pulled from the search indexes before weighted re-ranking;
+# full-text and trigram matches are capped separately, so a search
+# returns at most twice this many books
+BOOKS_SEARCH_CANDIDATE_LIMIT = int(os.getenv('BOOKS_SEARCH_CANDIDATE_LIMIT', '200'))
+# In-process LRU of ranked search results (entries, seconds)
+BOOKS_SEARCH_CACHE_SIZE = int(os.getenv('BOOKS_SEARCH_CACHE_SIZE', '512'))
+BOOKS_SEARCH_CACHE_TTL = int(os.getenv('BOOKS_SEARCH_CACHE_TTL', '60'))
+# Seconds anonymous book list/detail responses are served from cache
+BOOKS_RESPONSE_CACHE_TTL = int(os.getenv('BOOKS_RESPONSE_CACHE_TTL', '60'))
+# 'sync' refreshes a book's search vector in the saving request (the
+# PostgreSQL trigger does it); 'deferred' switches the trigger off for the
+# app's connections and queues it for the process_search_queue worker
+BOOKS_SEARCH_REFRESH_MODE = os.getenv('BOOKS_SEARCH_REFRESH_MODE', 'sync')
+
+# Accounts
+# Seconds a user's group names are cached across requests (0 keeps only
+# the per-request memo). Ignored unless CACHE_IS_SHARED: with a per-process
+# cache, group changes would not reach the other workers
+ACCOUNTS_ROLE_CACHE_TTL = int(os.getenv('ACCOUNTS_ROLE_CACHE_TTL', '0'))
+# Embed roles in access tokens and authenticate without loading the user
+# row; role changes then apply when the access token is refreshed
+ACCOUNTS_STATELESS_JWT = os.getenv('ACCOUNTS_STATELESS_JWT', 'False') == 'True'
+# In-process LRU of validated JWTs (entries, max seconds; exp always wins)
+ACCOUNTS_TOKEN_CACHE_SIZE = int(os.getenv('ACCOUNTS_TOKEN_CACHE_SIZE', '4096'))
+ACCOUNTS_TOKEN_CACHE_TTL = int(os.getenv('ACCOUNTS_TOKEN_CACHE_TTL', '300'))
+
+# Loans
+# Rows fetched per server-side cursor round trip by the loan export
+LOANS_EXPORT_CHUNK_SIZE = int(os.getenv('LOANS_EXPORT_CHUNK_SIZE', '2000'))
+# Maximum active loans per group; users in several groups get the highest
+LOANS_BORROWING_LIMITS = {
+    'Administrators': int(os.getenv('LOANS_ADMINISTRATOR_LIMIT', '10')),
+    'Members': int(os.getenv('LOANS_MEMBER_LIMIT', '1')),
+}
+# Limit for users in none of the groups above
+LOANS_DEFAULT_BORROWING_LIMIT = int(os.getenv('LOANS_DEFAULT_BORROWING_LIMIT', '1'))
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -14,6 +14,17 @@ DATABASES = {
     }
 }
 
+# Local in-memory stand-in for the shared cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'library-test-cache',
+        'KEY_PREFIX': 'library-test',
+    }
+}
+CACHE_IS_SHARED = False
+CACHE_HAS_ATOMIC_INCR = False
+
 # Disable password hashing for faster tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -2,12 +2,23 @@
 Pytest configuration and fixtures.
 """
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from django.contrib.auth.models import Group
+from apps.accounts.authentication import token_cache
 from apps.accounts.models import User
 from apps.books.models import Book
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache."""
+    cache.clear()
+    token_cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Return an API client for making requests."""
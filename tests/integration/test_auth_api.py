@@ -80,6 +80,21 @@ class TestLoginAPI:
         response = api_client.post(url, data)
         assert response.status_code == 401
 
+    def test_rotated_refresh_token_is_revoked(self, api_client, member_user, django_capture_on_commit_callbacks):
+        """Test a refresh token cannot be reused after rotation."""
+        response = api_client.post(reverse('login'), {
+            'email': 'member@library.com',
+            'password': 'MemberPass123!'
+        })
+        refresh = response.data['refresh']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(reverse('token_refresh'), {'refresh': refresh})
+        assert response.status_code == 200
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': refresh})
+        assert response.status_code == 401
+
 
 @pytest.mark.django_db
 class TestProfileAPI:
@@ -120,3 +135,67 @@ class TestAuthorizationAPI:
         url = reverse('user-list')
         response = api_client.get(url)
         assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestStatelessTokens:
+    """Tests for role claims in access tokens."""
+
+    @pytest.fixture
+    def stateless(self, settings):
+        settings.ACCOUNTS_STATELESS_JWT = True
+
+    def _login(self, client, email, password):
+        response = client.post(reverse('login'), {'email': email, 'password': password})
+        return response.data
+
+    def test_default_tokens_have_no_role_claims(self, api_client, member_user):
+        """Test roles are only embedded when stateless mode is on."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        tokens = self._login(api_client, 'member@library.com', 'MemberPass123!')
+        assert 'roles' not in AccessToken(tokens['access'])
+
+    def test_login_embeds_roles(self, stateless, api_client, admin_user):
+        """Test the access token carries roles and the active flag."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        tokens = self._login(api_client, 'admin@library.com', 'AdminPass123!')
+        access = AccessToken(tokens['access'])
+        assert access['roles'] == ['Administrators', 'Members']
+        assert access['is_active'] is True
+
+    def test_authenticated_read_skips_user_queries(self, stateless, api_client, admin_user, django_assert_num_queries):
+        """Test an admin request runs only its own loan query."""
+        tokens = self._login(api_client, 'admin@library.com', 'AdminPass123!')
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse('loan-all-loans'))
+        assert response.status_code == 200
+
+    def test_profile_loads_full_user(self, stateless, api_client, member_user):
+        """Test the profile endpoint still returns the database user."""
+        tokens = self._login(api_client, 'member@library.com', 'MemberPass123!')
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = api_client.get(reverse('profile'))
+        assert response.status_code == 200
+        assert response.data['email'] == 'member@library.com'
+
+    def test_refresh_picks_up_group_changes(self, stateless, api_client, member_user, admin_group):
+        """Test refreshed access tokens carry the user's current roles."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        tokens = self._login(api_client, 'member@library.com', 'MemberPass123!')
+        member_user.groups.add(admin_group)
+
+        response = api_client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        assert response.status_code == 200
+        assert 'Administrators' in AccessToken(response.data['access'])['roles']
+
+    def test_checkout_with_token_user(self, stateless, api_client, member_user, sample_book):
+        """Test loan writes work for users built from token claims."""
+        tokens = self._login(api_client, 'member@library.com', 'MemberPass123!')
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = api_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        assert response.status_code == 201
+        assert response.data['user_email'] == 'member@library.com'
+
+        response = api_client.get(reverse('loan-current'))
+        assert len(response.data['results']) == 1
@@ -128,3 +128,242 @@ class TestBookDeleteAPI:
         url = reverse('book-detail', args=[sample_book.id])
         response = authenticated_member_client.delete(url)
         assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestBooksKeysetPagination:
+    """Tests for cursor (keyset) pagination on the books list."""
+
+    @pytest.fixture
+    def catalog(self, db):
+        from apps.books.models import Book
+        return [
+            Book.objects.create(
+                title=f'Book {index}',
+                author='Same Author',
+                isbn=f'978000000{index:04d}',
+                genre='Fiction',
+            )
+            for index in range(7)
+        ]
+
+    def _walk(self, api_client, params):
+        url = reverse('book-list')
+        response = api_client.get(url, params)
+        pages = [response]
+        while response.data['next']:
+            response = api_client.get(response.data['next'])
+            pages.append(response)
+        return pages
+
+    def test_cursor_walks_every_book_once(self, api_client, catalog):
+        """Test following next links visits every book in order."""
+        pages = self._walk(api_client, {'cursor': '', 'page_size': 3})
+        titles = [book['title'] for page in pages for book in page.data['results']]
+        assert titles == [f'Book {index}' for index in range(7)]
+        assert len(pages) == 3
+        assert 'total_count' not in pages[0].data
+        assert pages[0].data['previous'] is None
+
+    def test_cursor_ties_broken_by_id(self, api_client, catalog):
+        """Test ordering on a non-unique column stays stable across pages."""
+        pages = self._walk(api_client, {'cursor': '', 'page_size': 2, 'ordering': 'author_desc'})
+        ids = [book['id'] for page in pages for book in page.data['results']]
+        assert ids == sorted(book.id for book in catalog)
+
+    def test_previous_link_returns_prior_page(self, api_client, catalog):
+        """Test previous link mirrors the forward walk."""
+        url = reverse('book-list')
+        first = api_client.get(url, {'cursor': '', 'page_size': 3, 'ordering': 'title_desc'})
+        second = api_client.get(first.data['next'])
+        back = api_client.get(second.data['previous'])
+        assert back.data['results'] == first.data['results']
+        assert back.data['previous'] is None
+
+    def test_tampered_cursor_rejected(self, api_client, catalog):
+        """Test a cursor that fails signature checks returns 404."""
+        url = reverse('book-list')
+        response = api_client.get(url, {'cursor': 'not-a-cursor'})
+        assert response.status_code == 404
+
+    def test_cursor_rejected_with_search(self, api_client, catalog):
+        """Test search results are not cursor-paginated out of relevance order."""
+        url = reverse('book-list')
+        response = api_client.get(url, {'cursor': '', 'search': 'Book'})
+        assert response.status_code == 400
+        assert 'cursor' in response.data
+
+
+@pytest.mark.django_db
+class TestBooksListCount:
+    """Tests for total_count on the books list."""
+
+    def test_count_reported_as_exact(self, api_client, sample_book, another_book):
+        """Test small result sets report an exact count."""
+        url = reverse('book-list')
+        response = api_client.get(url)
+        assert response.data['total_count'] == 2
+        assert response.data['count_is_exact'] is True
+
+    def test_exact_count_cached_per_filter_signature(self, api_client, sample_book, another_book):
+        """Test repeated filters reuse the cached count instead of COUNT(*)."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('book-list')
+        api_client.get(url, {'genre': 'programming', 'page': 1})
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {'genre': 'Programming ', 'page_size': 5})
+        assert response.data['total_count'] == 2
+        assert not any('COUNT(' in query['sql'] for query in queries.captured_queries)
+
+    def test_stale_count_does_not_truncate_page(self, api_client, sample_book, another_book):
+        """Test a cached count lower than the real total still returns full pages."""
+        from apps.books.models import Book
+
+        url = reverse('book-list')
+        api_client.get(url, {'page_size': 10})
+        # bulk_create() skips the signals, so the cached count stays at 2
+        Book.objects.bulk_create([Book(title='Third', author='Someone', isbn='9780000000001')])
+        response = api_client.get(url, {'page_size': 20})
+        assert response.data['total_count'] == 2
+        assert len(response.data['results']) == 3
+
+
+@pytest.mark.django_db
+class TestBookConditionalRequests:
+    """Tests for ETag / Last-Modified handling."""
+
+    def test_detail_not_modified_with_etag(self, api_client, sample_book):
+        """Test a matching If-None-Match returns 304 with no body."""
+        url = reverse('book-detail', args=[sample_book.id])
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response['Last-Modified']
+
+        cached = api_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached.status_code == 304
+        assert cached.content == b''
+
+    def test_detail_modified_after_update(self, api_client, sample_book):
+        """Test an updated book no longer matches the old ETag."""
+        url = reverse('book-detail', args=[sample_book.id])
+        etag = api_client.get(url)['ETag']
+        sample_book.title = 'Clean Code, 2nd Edition'
+        sample_book.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_detail_if_modified_since(self, api_client, sample_book):
+        """Test If-Modified-Since at or after updated_at returns 304."""
+        url = reverse('book-detail', args=[sample_book.id])
+        last_modified = api_client.get(url)['Last-Modified']
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+    def test_list_not_modified_until_catalog_changes(self, api_client, sample_book):
+        """Test list ETags hold until a book is added."""
+        url = reverse('book-list')
+        etag = api_client.get(url, {'genre': 'Programming'})['ETag']
+        assert api_client.get(url, {'genre': 'Programming'}, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        from apps.books.models import Book
+        Book.objects.create(title='Refactoring', author='Martin Fowler', isbn='9780201485677', genre='Programming')
+        response = api_client.get(url, {'genre': 'Programming'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data['total_count'] == 2
+
+    def test_list_etag_differs_per_page(self, api_client, sample_book, another_book):
+        """Test different pages of the same filters have different ETags."""
+        url = reverse('book-list')
+        first = api_client.get(url, {'page_size': 1})
+        second = api_client.get(url, {'page_size': 1, 'page': 2})
+        assert first['ETag'] != second['ETag']
+
+    def test_cursor_list_skips_aggregates(self, authenticated_member_client, sample_book):
+        """Test cursor pages get an ETag without MAX or COUNT queries."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('book-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_member_client.get(url, {'cursor': ''})
+        assert response['ETag']
+        assert not response.has_header('Last-Modified')
+        assert not any(
+            'MAX(' in query['sql'] or 'COUNT(' in query['sql'] for query in queries.captured_queries
+        )
+
+    def test_list_etag_changes_on_delete(self, api_client, sample_book, another_book):
+        """Test removing a book invalidates list ETags even though max(updated_at) may not move."""
+        url = reverse('book-list')
+        etag = api_client.get(url)['ETag']
+        sample_book.delete()
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_list_if_modified_since_after_delete(self, api_client, sample_book, another_book):
+        """Test If-Modified-Since never returns 304 for a list that lost a book."""
+        from django.utils.http import http_date
+
+        url = reverse('book-list')
+        response = api_client.get(url)
+        assert not response.has_header('Last-Modified')
+
+        sample_book.delete()
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        assert response.status_code == 200
+        assert response.data['total_count'] == 1
+
+
+@pytest.mark.django_db
+class TestBookResponseCache:
+    """Tests for the anonymous response cache."""
+
+    def test_anonymous_repeat_served_from_cache(self, api_client, sample_book, django_assert_num_queries):
+        """Test a repeated anonymous read does not touch the database."""
+        url = reverse('book-detail', args=[sample_book.id])
+        first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second.status_code == 200
+        assert second.data == first.data
+        assert second['ETag'] == first['ETag']
+
+    def test_authenticated_requests_bypass_cache(self, api_client, authenticated_member_client, sample_book):
+        """Test authenticated reads never see the anonymous cache."""
+        from apps.books.models import Book
+        url = reverse('book-detail', args=[sample_book.id])
+        api_client.get(url)
+        # Signal-free write: the anonymous entry is now stale
+        Book.objects.filter(pk=sample_book.pk).update(title='Renamed')
+        assert api_client.get(url).data['title'] == 'Clean Code'
+        assert authenticated_member_client.get(url).data['title'] == 'Renamed'
+
+    def test_checkout_invalidates_cached_detail(self, api_client, authenticated_member_client, sample_book):
+        """Test an availability flip from a loan is visible to anonymous readers."""
+        url = reverse('book-detail', args=[sample_book.id])
+        assert api_client.get(url).data['is_available'] is True
+        authenticated_member_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        assert api_client.get(url).data['is_available'] is False
+
+    def test_unknown_params_are_not_cached(self, api_client, sample_book):
+        """Test arbitrary query parameters never create cache entries."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('book-list')
+        api_client.get(url, {'junk': 'x'})
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(url, {'junk': 'x'})
+        assert len(queries) > 0
+
+    def test_long_query_gives_valid_cache_key(self, api_client, sample_book):
+        """Test long filter values are hashed into a portable cache key."""
+        import warnings
+        from django.core.cache.backends.base import CacheKeyWarning
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            response = api_client.get(reverse('book-list'), {'genre': 'x' * 500})
+        assert response.status_code == 200
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 from django.urls import reverse
 from apps.books.models import Book
@@ -40,3 +42,95 @@ class TestCheckoutLimit:
         # 4. Checkout second book again (Should Succeed now)
         response3 = authenticated_member_client.post(checkout_url, {'book_id': second_book.id})
         assert response3.status_code == 201, "After checkin, checkout should succeed"
+
+    def test_group_limit_is_configurable(self, settings, authenticated_member_client, member_user):
+        """
+        Verify the per-group limit from settings is enforced by the loan counter.
+        """
+        settings.LOANS_BORROWING_LIMITS = {'Members': 3}
+        books = [
+            Book.objects.create(title=f"Book {i}", author="Author", isbn=f"978555000000{i}")
+            for i in range(4)
+        ]
+        checkout_url = reverse('loan-checkout')
+
+        for book in books[:3]:
+            response = authenticated_member_client.post(checkout_url, {'book_id': book.id})
+            assert response.status_code == 201
+
+        response = authenticated_member_client.post(checkout_url, {'book_id': books[3].id})
+        assert response.status_code == 400
+        assert response.data['error'] == "You can only borrow 3 books at a time."
+
+        member_user.refresh_from_db()
+        assert member_user.active_loan_count == 3
+        books[3].refresh_from_db()
+        assert books[3].is_available is True
+
+
+@pytest.mark.django_db
+class TestLoanCounterDrift:
+    """Test writes outside checkout and checkin keep the loan counter in step."""
+
+    @pytest.fixture
+    def loan(self, authenticated_member_client, sample_book):
+        from apps.loans.models import Loan
+        response = authenticated_member_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        return Loan.objects.get(pk=response.data['id'])
+
+    def test_deleting_book_frees_slot(self, loan, member_user, sample_book):
+        """Test the cascade from a deleted book releases the active loan's slot."""
+        sample_book.delete()
+        member_user.refresh_from_db()
+        assert member_user.active_loan_count == 0
+
+    def test_deleting_returned_loan_keeps_count(self, loan, member_user, another_book, authenticated_member_client):
+        """Test only active loans give a slot back when deleted."""
+        from apps.loans.checkout import return_loan
+        return_loan(loan)
+        authenticated_member_client.post(reverse('loan-checkout'), {'book_id': another_book.id})
+        loan.delete()
+        member_user.refresh_from_db()
+        assert member_user.active_loan_count == 1
+
+    def test_admin_return_frees_slot(self, client, admin_user, loan, member_user):
+        """Test marking a loan returned in the Django admin recounts the member's loans."""
+        from django.utils import timezone
+        admin_user.is_staff = admin_user.is_superuser = True
+        admin_user.save()
+        client.force_login(admin_user)
+        now = timezone.localtime()
+        response = client.post(reverse('admin:loans_loan_change', args=[loan.pk]), {
+            'user': loan.user_id,
+            'book': loan.book_id,
+            'due_date_0': loan.due_date.date().isoformat(),
+            'due_date_1': '12:00:00',
+            'returned_at_0': now.date().isoformat(),
+            'returned_at_1': now.strftime('%H:%M:%S'),
+        })
+        assert response.status_code == 302
+        member_user.refresh_from_db()
+        assert member_user.active_loan_count == 0
+
+    def test_reconcile_command_repairs_counts(self, loan, member_user, another_member_user):
+        """Test reconcile_loan_counts recomputes counters from active loans."""
+        from django.contrib.auth import get_user_model
+        from django.core.management import call_command
+        get_user_model().objects.update(active_loan_count=5)
+        call_command('reconcile_loan_counts', stdout=io.StringIO())
+        member_user.refresh_from_db()
+        another_member_user.refresh_from_db()
+        assert member_user.active_loan_count == 1
+        assert another_member_user.active_loan_count == 0
+
+    def test_missing_book_reported_before_limit(self, loan, authenticated_member_client):
+        """Test a member at their limit asking for a missing book gets 'Book not found.'."""
+        response = authenticated_member_client.post(reverse('loan-checkout'), {'book_id': 99999})
+        assert response.status_code == 400
+        assert response.data['book_id'] == ['Book not found.']
+
+    def test_duplicate_reported_before_limit(self, loan, authenticated_member_client, sample_book):
+        """Test a member at their limit asking for their own book again is told they have it."""
+        response = authenticated_member_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        assert response.status_code == 400
+        assert response.data['error'] == 'You already have this book.'
@@ -0,0 +1,77 @@
+"""
+Integration tests for the import_books management command.
+"""
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.books.models import Book
+
+
+def run_import(*args):
+    stdout, stderr = StringIO(), StringIO()
+    call_command('import_books', *args, stdout=stdout, stderr=stderr)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportBooksCommand:
+    """Tests for bulk catalog import."""
+
+    def test_imports_csv_in_batches(self, tmp_path):
+        """Test CSV rows are imported across several batches."""
+        path = tmp_path / 'books.csv'
+        lines = ['title,author,isbn,genre,page_count,published_date']
+        lines += [f'Book {i},Author {i},978-0-00-{i:07d},Fiction,{100 + i},2020-01-01' for i in range(5)]
+        path.write_text('\n'.join(lines) + '\n')
+
+        stdout, _ = run_import(str(path), '--batch-size', '2')
+
+        assert Book.objects.count() == 5
+        book = Book.objects.get(isbn='9780000000003')
+        assert book.title == 'Book 3'
+        assert book.page_count == 103
+        assert book.published_date.isoformat() == '2020-01-01'
+        assert 'Imported 5 books' in stdout
+        assert 'rows/sec' in stdout
+
+    def test_imports_jsonl_and_upserts_by_isbn(self, tmp_path, sample_book):
+        """Test JSONL rows update existing books matched by ISBN."""
+        path = tmp_path / 'books.jsonl'
+        records = [
+            {'title': 'Updated Title', 'author': 'Test Author', 'isbn': sample_book.isbn},
+            {'title': 'New Book', 'author': 'New Author', 'isbn': '9780000000001', 'description': 'Fresh'},
+        ]
+        path.write_text('\n'.join(json.dumps(record) for record in records) + '\n')
+
+        run_import(str(path))
+
+        assert Book.objects.count() == 2
+        sample_book.refresh_from_db()
+        assert sample_book.title == 'Updated Title'
+        assert Book.objects.get(isbn='9780000000001').description == 'Fresh'
+
+    def test_skips_invalid_rows(self, tmp_path):
+        """Test rows with bad ISBNs or missing fields are reported and skipped."""
+        path = tmp_path / 'books.csv'
+        path.write_text(
+            'title,author,isbn\n'
+            'Good,Author,9780000000002\n'
+            'Bad ISBN,Author,12345\n'
+            ',No Title,9780000000003\n'
+        )
+
+        stdout, stderr = run_import(str(path))
+
+        assert list(Book.objects.values_list('isbn', flat=True)) == ['9780000000002']
+        assert 'ISBN must be 10 or 13 characters long.' in stderr
+        assert 'skipped 2 invalid rows' in stdout
+
+    def test_unknown_format_is_rejected(self, tmp_path):
+        """Test an input without a recognizable format needs --format."""
+        path = tmp_path / 'books.txt'
+        path.write_text('')
+        with pytest.raises(CommandError):
+            run_import(str(path))
@@ -1,8 +1,11 @@
 """
 Integration tests for loans API.
 """
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from apps.books.models import Book
 
 
@@ -59,6 +62,106 @@ class TestCheckoutBookAPI:
         data = {'book_id': 99999}
         response = authenticated_member_client.post(url, data)
         assert response.status_code == 400
+        assert response.data['book_id'] == ['Book not found.']
+
+    def test_checkout_writes_with_conditional_updates(self, authenticated_member_client, sample_book):
+        """Test checkout writes are the slot reservation, the book claim and the loan."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_member_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        assert response.status_code == 201
+
+        writes = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))
+        ]
+        assert [sql.split(' ')[:3] for sql in writes] == [
+            ['UPDATE', '"users"', 'SET'],
+            ['UPDATE', 'books', 'SET'],
+            ['INSERT', 'INTO', '"loans"'],
+        ]
+        member = response.wsgi_request.user
+        member.refresh_from_db()
+        assert member.active_loan_count == 1
+
+    def test_book_flagged_available_with_active_loan(
+        self, authenticated_member_client, another_member_user, sample_book
+    ):
+        """Test the per-book index stops a second active loan on one book."""
+        from apps.loans.models import Loan
+        Loan.objects.create(user=another_member_user, book=sample_book)
+
+        response = authenticated_member_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        assert response.status_code == 400
+        assert response.data['error'] == 'Book is not available.'
+        sample_book.refresh_from_db()
+        assert sample_book.is_available is True
+
+    def test_checkin_frees_borrowing_slot(self, authenticated_member_client, authenticated_admin_client, member_user, sample_book):
+        """Test the active loan counter follows checkout and checkin."""
+        response = authenticated_member_client.post(reverse('loan-checkout'), {'book_id': sample_book.id})
+        authenticated_admin_client.post(reverse('loan-checkin', args=[response.data['id']]))
+        member_user.refresh_from_db()
+        assert member_user.active_loan_count == 0
+
+        # A second checkin must not decrement again
+        response = authenticated_admin_client.post(reverse('loan-checkin', args=[response.data['id']]))
+        assert response.status_code == 400
+        member_user.refresh_from_db()
+        assert member_user.active_loan_count == 0
+
+
+@pytest.mark.django_db
+class TestCreateLoanAPI:
+    """Tests for manual loan creation."""
+
+    def test_member_can_create_loan(self, authenticated_member_client, sample_book):
+        """Test manual creation borrows the book like checkout."""
+        due_date = (timezone.now() + timedelta(days=7)).isoformat()
+        response = authenticated_member_client.post(
+            reverse('loan-list'), {'book_id': sample_book.id, 'due_date': due_date}
+        )
+        assert response.status_code == 201
+        assert response.data['book']['id'] == sample_book.id
+        sample_book.refresh_from_db()
+        assert sample_book.is_available is False
+
+    def test_create_respects_active_loan_limit(self, authenticated_member_client, sample_book, another_book):
+        """Test manual creation cannot bypass the one-loan limit."""
+        authenticated_member_client.post(reverse('loan-list'), {'book_id': sample_book.id})
+        response = authenticated_member_client.post(reverse('loan-list'), {'book_id': another_book.id})
+        assert response.status_code == 400
+        assert 'only borrow 1 book' in response.data['error']
+
+    def test_create_rejects_past_due_date(self, authenticated_member_client, sample_book):
+        """Test due dates must be in the future."""
+        due_date = (timezone.now() - timedelta(days=1)).isoformat()
+        response = authenticated_member_client.post(
+            reverse('loan-list'), {'book_id': sample_book.id, 'due_date': due_date}
+        )
+        assert response.status_code == 400
+        assert 'due_date' in response.data
+
+    def test_member_due_date_capped_at_loan_period(self, authenticated_member_client, sample_book):
+        """Test members cannot extend a loan past the default loan period."""
+        due_date = (timezone.now() + timedelta(days=365)).isoformat()
+        response = authenticated_member_client.post(
+            reverse('loan-list'), {'book_id': sample_book.id, 'due_date': due_date}
+        )
+        assert response.status_code == 400
+        assert 'due_date' in response.data
+        sample_book.refresh_from_db()
+        assert sample_book.is_available is True
+
+    def test_admin_can_set_long_due_date(self, authenticated_admin_client, sample_book):
+        """Test administrators may set due dates beyond the loan period."""
+        due_date = (timezone.now() + timedelta(days=365)).isoformat()
+        response = authenticated_admin_client.post(
+            reverse('loan-list'), {'book_id': sample_book.id, 'due_date': due_date}
+        )
+        assert response.status_code == 201
 
 
 @pytest.mark.django_db
@@ -157,3 +260,105 @@ class TestLoanListAPI:
         api_client.force_authenticate(user=admin_user)
         admin_response = api_client.get(url)
         assert admin_response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestLoanPagination:
+    """Tests for cursor pagination on loan lists."""
+
+    @pytest.fixture
+    def loans(self, member_group):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.accounts.models import User
+        from apps.loans.models import Loan
+        now = timezone.now()
+        loans = []
+        for index in range(5):
+            # One active loan per user
+            user = User.objects.create_user(
+                email=f'reader{index}@library.com', username=f'reader{index}', password='ReaderPass123!'
+            )
+            user.groups.add(member_group)
+            book = Book.objects.create(
+                title=f'Loaned {index}', author='Author', isbn=f'978100000{index:04d}', is_available=False
+            )
+            loans.append(Loan.objects.create(
+                user=user, book=book, due_date=now - timedelta(days=index + 1),
+            ))
+        return loans
+
+    def _walk(self, client, url, params):
+        response = client.get(url, params)
+        ids = [loan['id'] for loan in response.data['results']]
+        while response.data['next']:
+            response = client.get(response.data['next'])
+            ids += [loan['id'] for loan in response.data['results']]
+        return ids
+
+    def test_all_loans_walks_newest_first(self, authenticated_admin_client, loans):
+        """Test all_loans pages cover every loan, newest borrowed first."""
+        ids = self._walk(authenticated_admin_client, reverse('loan-all-loans'), {'page_size': 2})
+        assert ids == [loan.id for loan in reversed(loans)]
+
+    def test_overdue_ordered_by_due_date(self, authenticated_admin_client, loans):
+        """Test overdue pages follow due_date descending."""
+        ids = self._walk(authenticated_admin_client, reverse('loan-overdue'), {'page_size': 3})
+        assert ids == [loan.id for loan in loans]
+
+    def test_page_size_is_bounded(self, authenticated_admin_client, loans):
+        """Test page_size cannot exceed the maximum."""
+        response = authenticated_admin_client.get(reverse('loan-all-loans'), {'page_size': 10000})
+        assert response.data['page_size'] == 100
+        assert len(response.data['results']) == 5
+
+
+@pytest.mark.django_db
+class TestLoanExport:
+    """Tests for the streaming loan export."""
+
+    @pytest.fixture
+    def loans(self, member_user, another_member_user, sample_book, another_book):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.loans.models import Loan
+        overdue = Loan.objects.create(
+            user=member_user, book=sample_book, due_date=timezone.now() - timedelta(days=1)
+        )
+        active = Loan.objects.create(user=another_member_user, book=another_book)
+        return overdue, active
+
+    def _content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self, authenticated_admin_client, loans):
+        """Test NDJSON export yields one JSON document per loan."""
+        import json
+        response = authenticated_admin_client.get(reverse('loan-export'))
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        assert [row['id'] for row in rows] == [loan.id for loan in loans]
+        assert rows[0]['book']['title'] == 'Clean Code'
+
+    def test_csv_export_with_filters(self, authenticated_admin_client, member_user, loans):
+        """Test CSV export applies the overdue and user filters."""
+        response = authenticated_admin_client.get(
+            reverse('loan-export'), {'output': 'csv', 'overdue': 'true', 'user_id': member_user.id}
+        )
+        lines = self._content(response).splitlines()
+        assert lines[0].startswith('id,user_email,book_id')
+        assert len(lines) == 2
+        assert lines[1].startswith(f'{loans[0].id},member@library.com,')
+
+    def test_date_range_filter(self, authenticated_admin_client, loans):
+        """Test a borrowed_to date before any loan exports nothing."""
+        response = authenticated_admin_client.get(
+            reverse('loan-export'), {'borrowed_to': '2000-01-01'}
+        )
+        assert self._content(response) == ''
+
+    def test_member_cannot_export(self, authenticated_member_client, loans):
+        """Test export is admin only."""
+        response = authenticated_member_client.get(reverse('loan-export'))
+        assert response.status_code == 403
@@ -0,0 +1,93 @@
+"""
+Integration tests for the deferred search refresh queue.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from apps.books import search_queue
+from apps.books.models import Book, SearchRefreshQueue
+
+
+@pytest.fixture
+def deferred_mode(settings):
+    settings.BOOKS_SEARCH_REFRESH_MODE = 'deferred'
+
+
+@pytest.fixture
+def trigger_installed(monkeypatch):
+    """Behave as on PostgreSQL, where migration 0004 installs the trigger."""
+    monkeypatch.setattr(search_queue, 'search_trigger_installed', lambda using='default': True)
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """Record synchronous search vector refreshes."""
+    calls = []
+    monkeypatch.setattr(search_queue, 'refresh_search_vectors', lambda ids, using='default': calls.append(ids))
+    return calls
+
+
+@pytest.mark.django_db
+class TestSearchRefreshQueue:
+    """Tests for queueing and draining search refreshes."""
+
+    def test_sync_mode_leaves_refresh_to_trigger(self, trigger_installed, refreshed, authenticated_admin_client, sample_book):
+        """Test sync mode neither queues nor refreshes where the trigger runs."""
+        url = reverse('book-detail', args=[sample_book.id])
+        authenticated_admin_client.patch(url, {'title': 'Edited'})
+        assert not SearchRefreshQueue.objects.exists()
+        assert refreshed == []
+
+    def test_sync_mode_refreshes_without_trigger(self, sample_book, refreshed, authenticated_admin_client):
+        """Test sync mode refreshes at once where no trigger is installed."""
+        url = reverse('book-detail', args=[sample_book.id])
+        authenticated_admin_client.patch(url, {'title': 'Edited'})
+        assert not SearchRefreshQueue.objects.exists()
+        assert [list(ids) for ids in refreshed] == [[sample_book.id]]
+
+    def test_deferred_mode_takes_over_from_trigger(self, deferred_mode, trigger_installed, refreshed, authenticated_admin_client, sample_book):
+        """Test deferred mode queues writes even with the trigger installed."""
+        url = reverse('book-detail', args=[sample_book.id])
+        authenticated_admin_client.patch(url, {'title': 'Edited'})
+        assert list(SearchRefreshQueue.objects.values_list('book_id', flat=True)) == [sample_book.id]
+        assert refreshed == []
+
+    def test_deferred_mode_disables_trigger_for_connection(self, deferred_mode):
+        """Test app connections tell the trigger to skip their writes."""
+        executed = []
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def execute(self, sql, params):
+                executed.append(params)
+
+        connection = type('Connection', (), {'vendor': 'postgresql', 'cursor': lambda self: Cursor()})()
+        search_queue.configure_search_refresh_mode(connection)
+        assert executed == [[search_queue.SEARCH_REFRESH_MODE_SETTING]]
+
+    def test_book_writes_are_queued_once(self, deferred_mode, authenticated_admin_client, sample_book):
+        """Test repeated edits to one book coalesce into one queue entry."""
+        url = reverse('book-detail', args=[sample_book.id])
+        authenticated_admin_client.patch(url, {'title': 'First Edit'})
+        authenticated_admin_client.patch(url, {'title': 'Second Edit'})
+        assert list(SearchRefreshQueue.objects.values_list('book_id', flat=True)) == [sample_book.id]
+
+    def test_worker_drains_queue_in_batches(self, deferred_mode):
+        """Test the worker processes every queued book and empties the queue."""
+        Book.objects.bulk_upsert([
+            Book(title=f'Book {i}', author='Author', isbn=f'978000000003{i}') for i in range(5)
+        ])
+        assert SearchRefreshQueue.objects.count() == 5
+
+        stdout = StringIO()
+        call_command('process_search_queue', '--batch-size', '2', stdout=stdout)
+
+        assert not SearchRefreshQueue.objects.exists()
+        assert 'Processed 5 queued books.' in stdout.getvalue()
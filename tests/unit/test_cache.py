@@ -0,0 +1,65 @@
+"""
+Unit tests for the namespaced cache facade.
+"""
+from apps.core.cache import AppCache, books_cache, generation_scope, loans_cache
+
+
+class TestAppCache:
+    """Tests for AppCache."""
+
+    def test_namespaces_are_isolated(self):
+        """Test the same key in two namespaces holds different values."""
+        books_cache.set('answer', 'books')
+        loans_cache.set('answer', 'loans')
+        assert books_cache.get('answer') == 'books'
+        assert loans_cache.get('answer') == 'loans'
+
+    def test_invalidate_drops_only_own_namespace(self):
+        """Test invalidation orphans one namespace's keys."""
+        books_cache.set('answer', 42)
+        loans_cache.set('answer', 7)
+        books_cache.invalidate()
+        assert books_cache.get('answer') is None
+        assert loans_cache.get('answer') == 7
+
+    def test_get_or_set_computes_once(self):
+        """Test get_or_set only calls the default on a miss."""
+        calls = []
+        cache = AppCache('tests')
+
+        def compute():
+            calls.append(1)
+            return 'value'
+
+        assert cache.get_or_set('key', compute) == 'value'
+        assert cache.get_or_set('key', compute) == 'value'
+        assert len(calls) == 1
+
+    def test_invalidate_without_generation(self):
+        """Test invalidation works before any key was written."""
+        cache = AppCache('fresh')
+        cache.invalidate()
+        cache.set('key', 1)
+        assert cache.get('key') == 1
+
+    def test_generation_read_once_per_scope(self, monkeypatch):
+        """Test get()/set() reuse the generation inside a scope."""
+        cache = AppCache('scoped')
+        cache.set('key', 1)
+        reads = []
+        backend_get = cache.backend.get
+        monkeypatch.setattr(cache.backend, 'get', lambda key, *args: reads.append(key) or backend_get(key, *args))
+
+        with generation_scope():
+            cache.get('key')
+            cache.get('key')
+            cache.set('other', 2)
+        assert reads.count(cache.generation_key) == 1
+
+    def test_invalidate_updates_scope(self):
+        """Test a request sees its own invalidation at once."""
+        cache = AppCache('scoped')
+        with generation_scope():
+            cache.set('key', 1)
+            cache.invalidate()
+            assert cache.get('key') is None
@@ -0,0 +1,57 @@
+"""
+Equivalence tests for the fast-path serializers.
+"""
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from apps.books.models import Book
+from apps.books.serializers import BookListSerializer, BookListFastSerializer
+from apps.loans.models import Loan
+from apps.loans.serializers import LoanSerializer, LoanFastSerializer
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestBookListFastSerializer:
+    """BookListFastSerializer must match BookListSerializer byte for byte."""
+
+    def test_matches_model_serializer(self, sample_book, unavailable_book):
+        Book.objects.create(title='No Genre', author='Anon', isbn='1234567890')
+        queryset = Book.objects.order_by('pk')
+        expected = render(BookListSerializer(queryset, many=True).data)
+        fast = render(BookListFastSerializer.serialize(queryset.values(*BookListFastSerializer.values_fields)))
+        assert fast == expected
+
+    def test_empty_queryset(self):
+        assert BookListFastSerializer.serialize(Book.objects.none().values()) == []
+
+
+@pytest.mark.django_db
+class TestLoanFastSerializer:
+    """LoanFastSerializer must match LoanSerializer byte for byte."""
+
+    def test_matches_model_serializer(self, member_user, another_member_user, sample_book, another_book, unavailable_book):
+        now = timezone.now()
+        Loan.objects.create(user=member_user, book=sample_book)
+        Loan.objects.create(user=another_member_user, book=another_book, due_date=now - timedelta(days=2))
+        Loan.objects.create(
+            user=member_user, book=unavailable_book,
+            due_date=now - timedelta(days=5), returned_at=now - timedelta(days=1, microseconds=1),
+        )
+        queryset = Loan.objects.select_related('user', 'book').order_by('pk')
+
+        expected = render(LoanSerializer(queryset, many=True).data)
+        fast = render(LoanFastSerializer.serialize(queryset.values(*LoanFastSerializer.values_fields)))
+        assert fast == expected
+
+    def test_overdue_and_active_flags(self, member_user, sample_book):
+        loan = Loan.objects.create(
+            user=member_user, book=sample_book, due_date=timezone.now() - timedelta(hours=1)
+        )
+        row = LoanFastSerializer.serialize(Loan.objects.filter(pk=loan.pk).values(*LoanFastSerializer.values_fields))[0]
+        assert row['is_active'] is True
+        assert row['is_overdue'] is True
@@ -0,0 +1,67 @@
+"""
+Unit tests for configurable password hashers.
+"""
+from io import StringIO
+
+import pytest
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.management import call_command
+from apps.accounts.models import User
+
+SCRYPT = 'apps.accounts.hashers.ScryptPasswordHasher'
+PBKDF2 = 'apps.accounts.hashers.PBKDF2PasswordHasher'
+
+
+@pytest.fixture
+def cheap_hashers(settings):
+    """Prefer scrypt at a low cost so tests stay fast."""
+    settings.PASSWORD_HASHERS = [SCRYPT, PBKDF2, 'django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.ACCOUNTS_SCRYPT_WORK_FACTOR = 2 ** 4
+    settings.ACCOUNTS_PBKDF2_ITERATIONS = 1000
+    return settings
+
+
+class TestConfigurableHashers:
+    """Tests for hashers reading their cost from settings."""
+
+    def test_cost_comes_from_settings(self, cheap_hashers):
+        """Test new hashes use the configured work factor."""
+        encoded = make_password('MemberPass123!')
+        assert encoded.startswith('scrypt$16$')
+
+    def test_cost_change_requires_update(self, cheap_hashers):
+        """Test hashes made at an old cost are flagged for rehashing."""
+        encoded = make_password('MemberPass123!')
+        cheap_hashers.ACCOUNTS_SCRYPT_WORK_FACTOR = 2 ** 5
+        assert identify_hasher(encoded).must_update(encoded)
+
+
+@pytest.mark.django_db
+class TestRehashOnLogin:
+    """Tests for transparent upgrades of stored hashes."""
+
+    def test_old_algorithm_is_upgraded(self, member_user, cheap_hashers):
+        """Test a correct password rehashes with the preferred hasher."""
+        assert not member_user.password.startswith('scrypt$')
+
+        assert member_user.check_password('MemberPass123!')
+        member_user.refresh_from_db()
+        assert member_user.password.startswith('scrypt$16$')
+
+    def test_wrong_password_keeps_hash(self, member_user, cheap_hashers):
+        """Test a failed login never rewrites the stored hash."""
+        encoded = member_user.password
+        assert not member_user.check_password('WrongPassword!')
+        assert User.objects.get(pk=member_user.pk).password == encoded
+
+
+class TestBenchmarkHashers:
+    """Tests for the benchmark_hashers command."""
+
+    def test_reports_each_profile(self, cheap_hashers):
+        """Test throughput is reported for the requested profiles."""
+        out = StringIO()
+        call_command('benchmark_hashers', 'pbkdf2', 'scrypt', '--rounds', '2', stdout=out)
+        output = out.getvalue()
+        assert 'pbkdf2: ' in output and 'iterations 1000' in output
+        assert 'scrypt: ' in output and 'work factor 16' in output
@@ -5,7 +5,9 @@ import pytest
 from django.utils import timezone
 from datetime import timedelta
 from apps.accounts.models import User
+from apps.books import signals
 from apps.books.models import Book
+from apps.core.cache import books_cache
 from apps.loans.models import Loan
 
 
@@ -66,6 +68,80 @@ class TestBookModel:
         )
         assert book.is_available is True
 
+    def test_search_fields_changed_tracks_dirty_fields(self, sample_book):
+        """Test only edits to searchable fields mark the book dirty."""
+        book = Book.objects.get(pk=sample_book.pk)
+        assert book.search_fields_changed is False
+        book.is_available = False
+        assert book.search_fields_changed is False
+        book.title = 'Refactoring'
+        assert book.search_fields_changed is True
+        book.save()
+        assert book.search_fields_changed is False
+
+    def test_availability_flip_skips_search_refresh(self, sample_book, monkeypatch):
+        """Test saving only availability does not refresh the search vector."""
+        calls = []
+        monkeypatch.setattr(Book, 'update_search_vector', lambda self: calls.append(self.pk))
+        book = Book.objects.get(pk=sample_book.pk)
+
+        book.is_available = False
+        book.save(update_fields=['is_available', 'updated_at'])
+        book.save()
+        assert calls == []
+
+        book.description = 'Updated description'
+        book.save()
+        assert calls == [book.pk]
+
+
+@pytest.mark.django_db
+class TestBookBulkWrites:
+    """Tests for the signal-free bulk write path."""
+
+    def test_bulk_upsert_inserts_and_updates_by_isbn(self, sample_book):
+        """Test bulk_upsert creates new books and updates existing ISBNs."""
+        written = Book.objects.bulk_upsert([
+            Book(title='Renamed', author=sample_book.author, isbn=sample_book.isbn),
+            Book(title='New Book', author='New Author', isbn='9780000000010'),
+        ])
+        assert written == 2
+        assert Book.objects.count() == 2
+        sample_book.refresh_from_db()
+        assert sample_book.title == 'Renamed'
+
+    def test_bulk_upsert_invalidates_cache(self):
+        """Test bulk writes drop cached catalog data even without signals."""
+        generation = books_cache.generation
+        Book.objects.bulk_upsert([Book(title='T', author='A', isbn='9780000000011')])
+        assert books_cache.generation != generation
+
+    def test_bulk_update_with_search_bumps_updated_at(self, sample_book):
+        """Test bulk_update_with_search writes fields and updated_at."""
+        before = sample_book.updated_at
+        sample_book.title = 'Changed'
+        Book.objects.bulk_update_with_search([sample_book], ['title'])
+        sample_book.refresh_from_db()
+        assert sample_book.title == 'Changed'
+        assert sample_book.updated_at > before
+
+    def test_deferred_signals_flush_once(self, monkeypatch):
+        """Test deferred signals refresh all saved books in one call on exit."""
+        calls = []
+        monkeypatch.setattr(signals, 'schedule_search_refresh', lambda ids, using: calls.append(set(ids)))
+
+        generation = books_cache.generation
+        with signals.deferred_book_signals():
+            books = [
+                Book.objects.create(title=f'Book {i}', author='A', isbn=f'978000000002{i}')
+                for i in range(3)
+            ]
+            assert books_cache.generation == generation
+            assert calls == []
+
+        assert calls == [{book.pk for book in books}]
+        assert books_cache.generation != generation
+
 
 @pytest.mark.django_db
 class TestLoanModel:
@@ -0,0 +1,37 @@
+"""
+Unit tests for the books ordering filter.
+"""
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from apps.books.models import Book
+from apps.books.ordering import CustomOrderingFilter
+from apps.books.views import BookViewSet
+
+
+def _ordering(params, queryset):
+    request = Request(APIRequestFactory().get('/v1/books/', params))
+    return CustomOrderingFilter().get_ordering(request, queryset, BookViewSet())
+
+
+@pytest.mark.django_db
+class TestCustomOrderingFilter:
+    """Tests for CustomOrderingFilter."""
+
+    def test_suffixes_translated(self):
+        """Test _asc/_desc suffixes map to Django ordering."""
+        assert _ordering({'ordering': 'title_desc,author_asc'}, Book.objects.all()) == ['-title', 'author']
+
+    def test_unknown_fields_dropped(self):
+        """Test fields outside ordering_fields fall back to the default."""
+        assert _ordering({'ordering': 'isbn_desc'}, Book.objects.all()) == ['created_at']
+
+    def test_search_keeps_relevance_order(self):
+        """Test ranked search results are not re-sorted by default."""
+        ranked = Book.objects.order_by('pk')
+        assert _ordering({'search': 'code'}, ranked) is None
+
+    def test_explicit_ordering_overrides_relevance(self):
+        """Test an explicit ordering still applies to search results."""
+        ranked = Book.objects.order_by('pk')
+        assert _ordering({'search': 'code', 'ordering': 'title_asc'}, ranked) == ['title']
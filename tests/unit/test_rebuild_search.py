@@ -0,0 +1,31 @@
+"""
+Unit tests for the batched rebuild_search command.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from apps.books.management.commands.rebuild_search import id_ranges
+
+
+class TestIdRanges:
+    """Tests for splitting the id space into batches."""
+
+    def test_ranges_are_disjoint_and_cover_bounds(self):
+        """Test ranges are consecutive, inclusive and end at the last id."""
+        assert list(id_ranges(1, 10, 4)) == [(1, 4), (5, 8), (9, 10)]
+
+    def test_single_id(self):
+        """Test a one-row table yields one range."""
+        assert list(id_ranges(7, 7, 100)) == [(7, 7)]
+
+
+@pytest.mark.django_db
+class TestRebuildSearchCommand:
+    """Tests for the command outside PostgreSQL."""
+
+    def test_skips_without_postgres(self, sample_book):
+        """Test the command warns instead of failing on SQLite."""
+        stdout = StringIO()
+        call_command('rebuild_search', '--only-stale', '--workers', '2', stdout=stdout)
+        assert 'requires PostgreSQL' in stdout.getvalue()
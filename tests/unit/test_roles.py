@@ -0,0 +1,68 @@
+"""
+Unit tests for cached role resolution.
+"""
+import pytest
+from django.urls import reverse
+from apps.accounts.models import User
+from apps.accounts.roles import get_roles, is_administrator
+from apps.loans.models import Loan
+
+
+@pytest.fixture
+def shared_role_cache(settings):
+    """Cache roles across requests, as with a shared cache backend."""
+    settings.CACHE_IS_SHARED = True
+    settings.ACCOUNTS_ROLE_CACHE_TTL = 300
+
+
+@pytest.mark.django_db
+class TestRoleResolution:
+    """Tests for get_roles and its caches."""
+
+    def test_roles_memoized_on_user(self, admin_user, django_assert_num_queries):
+        """Test group names are loaded once per user object."""
+        user = User.objects.get(pk=admin_user.pk)
+        with django_assert_num_queries(1):
+            assert is_administrator(user)
+            assert user.is_administrator
+            assert user.is_member
+
+    def test_roles_shared_across_user_objects(self, shared_role_cache, admin_user, django_assert_num_queries):
+        """Test a fresh user object reads roles from the shared cache."""
+        get_roles(User.objects.get(pk=admin_user.pk))
+        user = User.objects.get(pk=admin_user.pk)
+        with django_assert_num_queries(0):
+            assert is_administrator(user)
+
+    def test_process_local_cache_not_shared(self, settings, admin_user, django_assert_num_queries):
+        """Test roles are not cached across requests when workers do not share the cache."""
+        settings.ACCOUNTS_ROLE_CACHE_TTL = 300
+        get_roles(User.objects.get(pk=admin_user.pk))
+        user = User.objects.get(pk=admin_user.pk)
+        with django_assert_num_queries(1):
+            assert is_administrator(user)
+
+    def test_group_change_invalidates_roles(self, shared_role_cache, member_user, admin_group):
+        """Test adding or removing a group is seen immediately."""
+        assert not is_administrator(member_user)
+
+        member_user.groups.add(admin_group)
+        assert is_administrator(member_user)
+        assert is_administrator(User.objects.get(pk=member_user.pk))
+
+        admin_group.user_set.remove(member_user)
+        assert not is_administrator(User.objects.get(pk=member_user.pk))
+
+    def test_anonymous_user_has_no_roles(self):
+        """Test anonymous users resolve to no roles without queries."""
+        from django.contrib.auth.models import AnonymousUser
+        assert get_roles(AnonymousUser()) == frozenset()
+
+    def test_loan_detail_resolves_roles_once(
+        self, authenticated_admin_client, admin_user, member_user, sample_book, django_assert_num_queries
+    ):
+        """Test an admin loan detail request runs one group query and one loan query."""
+        loan = Loan.objects.create(user=member_user, book=sample_book)
+        with django_assert_num_queries(2):
+            response = authenticated_admin_client.get(reverse('loan-detail', args=[loan.id]))
+        assert response.status_code == 200
@@ -0,0 +1,78 @@
+"""
+Unit tests for the in-process search result cache.
+"""
+import pytest
+from django.http import QueryDict
+from apps.books.search import search_cache, search_cache_key
+from apps.core.cache import books_cache
+from apps.core.lru import LRUCache
+
+
+class TestLRUCache:
+    """Tests for the LRU cache primitive."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry goes first when full."""
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+
+    def test_expired_entries_are_misses(self):
+        """Test entries past their TTL are not returned."""
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1, ttl=-1)
+        assert cache.get('a') is None
+        assert cache.misses == 1
+        assert len(cache) == 0
+
+
+class TestSearchCacheKey:
+    """Tests for search cache key normalization."""
+
+    def test_term_and_filters_normalized(self):
+        """Test case, whitespace and parameter order do not split entries."""
+        first = search_cache_key('  Clean   CODE ', QueryDict('genre=Programming&is_available=true&page=2'))
+        second = search_cache_key('clean code', QueryDict('is_available=True&genre=programming'))
+        assert first == second
+
+    def test_ordering_and_filters_distinguish_entries(self):
+        """Test different filters or ordering use different entries."""
+        base = search_cache_key('code', QueryDict('genre=programming'))
+        assert base != search_cache_key('code', QueryDict('genre=fiction'))
+        assert base != search_cache_key('code', QueryDict('genre=programming&ordering=title_asc'))
+
+    def test_availability_filter_follows_books_generation(self):
+        """Test only availability-filtered keys change when loans bump the books cache."""
+        plain = search_cache_key('code', QueryDict('genre=programming'))
+        available = search_cache_key('code', QueryDict('is_available=true'))
+        books_cache.invalidate()
+        assert search_cache_key('code', QueryDict('genre=programming')) == plain
+        assert search_cache_key('code', QueryDict('is_available=true')) != available
+
+
+@pytest.mark.django_db
+class TestSearchCacheInvalidation:
+    """Tests for invalidation on Book writes."""
+
+    def test_save_and_delete_clear_cache(self, sample_book):
+        """Test book writes drop cached results."""
+        search_cache.set('key', [sample_book.id])
+        sample_book.title = 'Cleaner Code'
+        sample_book.save()
+        assert search_cache.get('key') is None
+
+        search_cache.set('key', [sample_book.id])
+        sample_book.delete()
+        assert search_cache.get('key') is None
+
+    def test_availability_flip_keeps_cache(self, sample_book):
+        """Test checkout-style saves leave ranked results alone."""
+        search_cache.set('key', [sample_book.id])
+        sample_book.is_available = False
+        sample_book.save(update_fields=['is_available', 'updated_at'])
+        assert search_cache.get('key') == [sample_book.id]
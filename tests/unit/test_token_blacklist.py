@@ -0,0 +1,115 @@
+"""
+Unit tests for the bloom filter in front of the refresh token blacklist.
+"""
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.accounts.blacklist import BlacklistFilter, BloomFilter, blacklist_filter
+from apps.accounts.tokens import RefreshToken
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter."""
+
+    def test_added_items_are_members(self):
+        """Test a bloom filter never reports a false negative."""
+        bloom = BloomFilter(1000)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate_is_bounded(self):
+        """Test unseen items rarely match at the configured error rate."""
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+@pytest.fixture
+def shared_cache(settings):
+    """Trust the filter, as with a Redis cache shared by every worker."""
+    settings.CACHE_IS_SHARED = True
+    settings.CACHE_HAS_ATOMIC_INCR = True
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBlacklistCheck:
+    """Tests for RefreshToken.check_blacklist."""
+
+    def test_valid_token_check_needs_no_queries(self, shared_cache, member_user):
+        """Test tokens missing from the filter skip the blacklist query."""
+        token = RefreshToken.for_user(member_user)
+        token.check_blacklist()
+
+        with CaptureQueriesContext(connection) as queries:
+            token.check_blacklist()
+        assert len(queries) == 0
+
+    def test_blacklisting_reaches_the_filter(self, shared_cache, member_user):
+        """Test a newly blacklisted token is rejected after the filter was built."""
+        token = RefreshToken.for_user(member_user)
+        token.check_blacklist()
+
+        token.blacklist()
+        assert blacklist_filter.might_be_blacklisted(token['jti'])
+        with pytest.raises(TokenError):
+            token.check_blacklist()
+
+    def test_revocation_reaches_other_process_without_reload(self, shared_cache, member_user):
+        """Test a token blacklisted through one filter is caught by another sharing the cache."""
+        first, second = BlacklistFilter(), BlacklistFilter()
+        token = RefreshToken.for_user(member_user)
+        assert not first.might_be_blacklisted(token['jti'])
+        assert not second.might_be_blacklisted(token['jti'])
+
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+        first.publish(token['jti'])
+
+        with CaptureQueriesContext(connection) as queries:
+            assert second.might_be_blacklisted(token['jti'])
+        assert len(queries) == 0
+
+    def test_process_local_cache_always_queries(self, member_user):
+        """Test the filter is not trusted when workers do not share the cache."""
+        token = RefreshToken.for_user(member_user)
+        token.check_blacklist()
+
+        with CaptureQueriesContext(connection) as queries:
+            token.check_blacklist()
+        assert len(queries) == 1
+
+    def test_shared_cache_without_atomic_incr_always_queries(self, settings, member_user):
+        """Test the filter is not trusted when concurrent publishes could collide."""
+        settings.CACHE_IS_SHARED = True
+        token = RefreshToken.for_user(member_user)
+        token.check_blacklist()
+
+        with CaptureQueriesContext(connection) as queries:
+            token.check_blacklist()
+        assert len(queries) == 1
+
+
+@pytest.mark.django_db
+class TestPruneTokens:
+    """Tests for the prune_tokens command."""
+
+    def test_deletes_only_expired_tokens(self, member_user):
+        """Test expired tokens and their blacklist rows are deleted in batches."""
+        for _ in range(3):
+            RefreshToken.for_user(member_user).blacklist()
+        OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(days=1))
+        live = RefreshToken.for_user(member_user)
+
+        call_command('prune_tokens', '--batch-size', '2', stdout=StringIO())
+
+        assert list(OutstandingToken.objects.values_list('jti', flat=True)) == [live['jti']]
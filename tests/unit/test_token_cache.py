@@ -0,0 +1,48 @@
+"""
+Unit tests for the validated JWT cache.
+"""
+import time
+from datetime import timedelta
+
+import pytest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.accounts.authentication import FlexibleJWTAuthentication, token_cache
+from apps.accounts.models import User
+
+
+@pytest.mark.django_db
+class TestTokenCache:
+    """Tests for FlexibleJWTAuthentication.get_validated_token caching."""
+
+    def test_repeat_validation_is_a_cache_hit(self, member_user):
+        """Test the second validation of one token comes from the LRU."""
+        raw = str(AccessToken.for_user(member_user)).encode()
+        auth = FlexibleJWTAuthentication()
+
+        first = auth.get_validated_token(raw)
+        hits = token_cache.hits
+        assert auth.get_validated_token(raw) is first
+        assert token_cache.hits == hits + 1
+
+    def test_entry_expires_with_token(self, member_user):
+        """Test cached entries never outlive the token's exp claim."""
+        token = AccessToken.for_user(member_user)
+        token.set_exp(lifetime=timedelta(seconds=2))
+        FlexibleJWTAuthentication().get_validated_token(str(token).encode())
+
+        (_, expires), = token_cache._data.values()
+        assert expires - time.monotonic() <= 2
+
+    def test_deactivated_user_rejected_on_hit(self, member_user):
+        """Test a cached token stops authenticating once its user is deactivated."""
+        raw = str(AccessToken.for_user(member_user)).encode()
+        auth = FlexibleJWTAuthentication()
+        token = auth.get_validated_token(raw)
+        assert auth.get_user(token) == member_user
+
+        User.objects.filter(pk=member_user.pk).update(is_active=False)
+        hits = token_cache.hits
+        with pytest.raises(AuthenticationFailed):
+            auth.get_user(auth.get_validated_token(raw))
+        assert token_cache.hits == hits + 1